@@ -9,6 +9,13 @@ const agentHistoryService = require('../services/agentHistoryService');
 const conversationService = require('../services/conversationService');
 const { normalizeMessage } = require('../utils/normalize');
 const settingsService = require('../services/settingsService');
+const { subscribeProjectEvent } = require('../services/projectEventService');
+
+// Upper bound for ?timeout= on the long-poll endpoint, in seconds.
+const MAX_EVENT_WAIT_SECONDS = 60;
+
+// Upper bound for ?limit= on the stalled-projects endpoint.
+const MAX_STALLED_PAGE_SIZE = 500;
 
 
 
@@ -111,6 +118,15 @@ const createLogEntry = (req, res) => tryCatch(res, async () => {
     return { id: newLog.id };
 });
 
+/**
+ * Inserts a batch of system log entries in one round-trip.
+ * Body: { entries: [{ projectId, message, level, code }, ...] }
+ */
+const createLogEntriesBatch = (req, res) => tryCatch(res, async () => {
+    const rows = await logService.insertLogs(req.body.entries);
+    return { ids: rows.map(r => r.id) };
+});
+
 /**
  * Saves a new summary for an agent.
  */
@@ -149,6 +165,21 @@ const getActiveProjects = (req, res) => tryCatch(res, async () => {
     return await projectService.getActiveProjects();
 });
 
+/**
+ * Returns only the active projects that should be paused, with the reason for each.
+ * Query: ?pendingMinutes=&idleMinutes=[&afterId=&limit=] → [{ id, reason, age_seconds }], ordered by id.
+ */
+const getStalledProjects = (req, res) => tryCatch(res, async () => {
+    const pendingMinutes = parseFloat(req.query.pendingMinutes);
+    const idleMinutes = parseFloat(req.query.idleMinutes);
+    if (!(pendingMinutes > 0) || !(idleMinutes > 0)) {
+        throw new Error('pendingMinutes and idleMinutes must be positive numbers');
+    }
+    const afterId = parseInt(req.query.afterId) || 0;
+    const limit = Math.min(parseInt(req.query.limit) || MAX_STALLED_PAGE_SIZE, MAX_STALLED_PAGE_SIZE);
+    return await projectService.getStalledProjects(pendingMinutes, idleMinutes, afterId, limit);
+});
+
 /**
  * Returns the oldest timestamp of any pending message.
  */
@@ -182,6 +213,53 @@ const getProjectFlags = (req, res) => tryCatch(res, async () => {
     return flags || { paused: true, message_limit: 0 };
 });
 
+/**
+ * Reads a project's flags and normalized pending messages as { flags, pending }.
+ */
+const readProjectStatus = async (projectId) => {
+    const row = await projectService.getProjectStatusAndPending(projectId);
+    if (!row) return { flags: { paused: true, message_limit: 0 }, pending: [] };
+
+    const { pending, ...flags } = row;
+    return { flags, pending: pending.map(normalizeMessage) };
+};
+
+/**
+ * Retrieves project flags and the pending work queue in one round-trip.
+ */
+const getProjectStatusAndPending = (req, res) => tryCatch(res, async () => {
+    return await readProjectStatus(req.params.projectId);
+});
+
+/**
+ * Long-poll: returns { flags, pending } as soon as the project has pending work or
+ * is no longer runnable, otherwise waits up to ?timeout= seconds (default 30) for a
+ * new message or pause before answering with the current state.
+ */
+const awaitNextProjectEvent = (req, res) => tryCatch(res, async () => {
+    const { projectId } = req.params;
+    const timeoutSeconds = Math.min(parseInt(req.query.timeout) || 30, MAX_EVENT_WAIT_SECONDS);
+
+    // Listen before reading, so an event raised while the status query runs still wakes us.
+    const subscription = subscribeProjectEvent(projectId);
+    let status;
+    try {
+        status = await readProjectStatus(projectId);
+    } catch (err) {
+        subscription.cancel();
+        throw err;
+    }
+    const { flags, pending } = status;
+    const limitReached = flags.message_limit !== null && flags.message_limit <= 0;
+    if (pending.length > 0 || flags.paused || !flags.is_token_active || limitReached) {
+        subscription.cancel();
+        return status;
+    }
+
+    await subscription.wait(timeoutSeconds * 1000);
+    return await readProjectStatus(projectId);
+});
+
 /**
  * Gets recent messages involving a specific agent.
  * Query param: ?limit= (default 20)
@@ -193,6 +271,16 @@ const getAgentRecentMessages = (req, res) => tryCatch(res, async () => {
     return messages;
 });
 
+/**
+ * Returns an agent's current summary and recent messages in one round-trip.
+ * Query param: ?limit= (default 20)
+ */
+const getAgentSummarizationContext = (req, res) => tryCatch(res, async () => {
+    const { projectId, agentId } = req.params;
+    const limit = parseInt(req.query.limit) || 20;
+    return await agentHistoryService.getSummarizationContext(projectId, agentId, limit);
+});
+
 module.exports = {
     getBrainContext,
     getPendingWorkQueue,
@@ -201,12 +289,17 @@ module.exports = {
     decrementMessageLimit,
     incrementAgentMessageCount,
     createLogEntry,
+    createLogEntriesBatch,
     createSummary,
     getAgentSummary,
     getProjectSummaries,
     getActiveProjects,
+    getStalledProjects,
     getOldestPendingTimestamp,
     pauseProject,
     getProjectFlags,
-    getAgentRecentMessages
+    getProjectStatusAndPending,
+    awaitNextProjectEvent,
+    getAgentRecentMessages,
+    getAgentSummarizationContext
 };
@@ -38,6 +38,9 @@ router.put('/messages/:messageId/status', internalController.updateMessageStatus
 // Creates a new system log entry
 router.post('/logs', internalController.createLogEntry);
 
+// Creates several system log entries in a single insert
+router.post('/logs/batch', internalController.createLogEntriesBatch);
+
 // Saves a new agent summary (memory)
 router.post('/summaries', internalController.createSummary);
 
@@ -56,15 +59,27 @@ router.post('/agents/:projectId/:agentId/increment-count', internalController.in
 // Returns current flags for a project (paused, limits, etc.)
 router.get('/projects/:projectId/flags', internalController.getProjectFlags);
 
+// Returns project flags and pending messages together (one round-trip per handler iteration)
+router.get('/projects/:projectId/status', internalController.getProjectStatusAndPending);
+
+// Long-polls until the project has pending work or changes state (?timeout= seconds)
+router.get('/projects/:projectId/next-event', internalController.awaitNextProjectEvent);
+
 // Gets recent messages involving a specific agent
 router.get('/agents/:projectId/:agentId/messages', internalController.getAgentRecentMessages);
 
+// Gets an agent's current summary and recent messages together (used for summarization)
+router.get('/agents/:projectId/:agentId/summarization-context', internalController.getAgentSummarizationContext);
+
 
 // ─────────── Watchdog Monitoring Routes ───────────
 
 // Returns all currently active projects
 router.get('/projects/active', internalController.getActiveProjects);
 
+// Returns only the active projects whose queue is stuck or that have gone idle (keyset-paged by id)
+router.get('/projects/stalled', internalController.getStalledProjects);
+
 // Returns timestamp of the oldest pending message in a project
 router.get('/projects/:projectId/oldest-pending', internalController.getOldestPendingTimestamp);
 
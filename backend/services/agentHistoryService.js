@@ -78,9 +78,34 @@ const getSummary = async (projectId, agentId) => {
   return await db.oneOrNone(query, [projectId, agentId]);
 };
 
+/**
+ * Returns what the brain needs to re-summarize an agent, in one query:
+ * its current summary and its most recent sent messages (newest first).
+ */
+const getSummarizationContext = async (projectId, agentId, limit = 20) => {
+  const query = `
+    SELECT
+      (
+        SELECT summary FROM agent_history_summaries
+        WHERE project_id = $1 AND agent_id = $2
+      ) AS last_summary,
+      COALESCE((
+        SELECT json_agg(m ORDER BY m.created_at DESC)
+        FROM (
+          SELECT * FROM messages
+          WHERE project_id = $1 AND status = 'sent' AND type IN ('user', 'assistant')
+            AND (sender_id = $2 OR receiver_id = $2)
+          ORDER BY created_at DESC LIMIT $3
+        ) m
+      ), '[]'::json) AS recent;
+  `;
+  return await db.one(query, [projectId, agentId, limit]);
+};
+
 module.exports = {
   saveSummary,
   incrementMessageCount,
   getLatestSummaries,
   getSummary,
+  getSummarizationContext,
 };
@@ -42,8 +42,28 @@ const insertLog = async ({ projectId, message, level = 'error', code = null }) =
   return await db.one(query, [projectId, message, level, code]);
 };
 
+/**
+ * Inserts many log entries in a single statement (used by internal brain services).
+ */
+const insertLogs = async (entries) => {
+  if (!Array.isArray(entries) || entries.length === 0) return [];
+
+  const query = `
+    INSERT INTO logs (project_id, message, level, code)
+    SELECT * FROM unnest($1::integer[], $2::text[], $3::text[], $4::text[])
+    RETURNING id;
+  `;
+  return await db.any(query, [
+    entries.map(e => e.projectId ?? null),
+    entries.map(e => e.message),
+    entries.map(e => e.level || 'error'),
+    entries.map(e => e.code ?? null),
+  ]);
+};
+
 module.exports = {
   getLogsByProject,
   deleteLogsByProject,
   insertLog,
+  insertLogs,
 };
@@ -6,6 +6,7 @@ const { MESSAGE_TYPES } = require('../config/constants');
 const { nudgeBrain } = require('./brainService');
 const { broadcastToProject } = require('./webSocketService');
 const { normalizeMessage } = require('../utils/normalize');
+const { notifyProjectEvent } = require('./projectEventService');
 
 
 // ──────────────── User-Facing Functions ────────────────
@@ -56,7 +57,7 @@ const createMessage = async (data) => {
     throw new Error("Message creation failed: Missing required ID fields.");
   }
 
-  return await db.tx(async t => {
+  const createdMessage = await db.tx(async t => {
     const status = data.status || ((type === MESSAGE_TYPES.USER || type === 'user') ? 'pending' : 'sent');
 
     const insertQuery = `
@@ -83,6 +84,10 @@ const createMessage = async (data) => {
 
     return newMessage;
   });
+
+  // Wake any brain handler long-polling this project, now that the insert is committed.
+  notifyProjectEvent(createdMessage.project_id);
+  return createdMessage;
 };
 
 
@@ -0,0 +1,55 @@
+// File: backend/services/projectEventService.js
+// Description: In-process project event bus backing the brain's long-poll endpoint.
+// Writers signal after committing a change the brain cares about (new message, pause);
+// the long-poll handler waits on the signal instead of the brain polling in a loop.
+
+const { EventEmitter } = require('events');
+
+const emitter = new EventEmitter();
+emitter.setMaxListeners(0); // One listener per waiting brain request; no fixed cap.
+
+/**
+ * Signals that a project's flags or pending work may have changed.
+ */
+const notifyProjectEvent = (projectId) => {
+  emitter.emit(String(projectId));
+};
+
+/**
+ * Starts listening for the project's next event immediately and returns a handle:
+ * `wait(timeoutMs)` resolves `true` on the event (including one that fired before
+ * it was called) or `false` after `timeoutMs`; `cancel()` stops listening.
+ * Subscribe before reading state, so an event raised during the read is not missed.
+ */
+const subscribeProjectEvent = (projectId) => {
+  const key = String(projectId);
+  let fired = false;
+  let wake = null;
+
+  const onEvent = () => {
+    fired = true;
+    if (wake) wake(true);
+  };
+  emitter.once(key, onEvent);
+
+  const cancel = () => emitter.off(key, onEvent);
+
+  const wait = (timeoutMs) => new Promise((resolve) => {
+    if (fired) return resolve(true);
+    const timer = setTimeout(() => {
+      cancel();
+      resolve(false);
+    }, timeoutMs);
+    wake = (result) => {
+      clearTimeout(timer);
+      resolve(result);
+    };
+  });
+
+  return { wait, cancel };
+};
+
+module.exports = {
+  notifyProjectEvent,
+  subscribeProjectEvent,
+};
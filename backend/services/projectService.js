@@ -4,6 +4,7 @@
 const db = require('../config/db');
 const { nudgeBrain } = require('./brainService');
 const { broadcastToProject } = require('./webSocketService');
+const { notifyProjectEvent } = require('./projectEventService');
 
 
 
@@ -145,7 +146,7 @@ const getProjectById = async (projectId, userId) => {
  */
 const updateProjectStatus = async (projectId, userId, paused) => {
   // Use a transaction to ensure all database operations succeed or fail together.
-  return await db.tx(async t => {
+  const result = await db.tx(async t => {
     let updatedProject;
 
     if (paused === false) {
@@ -183,6 +184,9 @@ const updateProjectStatus = async (projectId, userId, paused) => {
 
     return updatedProject;
   });
+
+  if (result) notifyProjectEvent(projectId);
+  return result;
 };
 
 
@@ -359,6 +363,32 @@ const getProjectFlags = async (projectId) => {
   return await db.oneOrNone(query, [projectId]);
 };
 
+/**
+ * [BRAIN] Gets a project's flags together with its pending messages in a single query.
+ * Returns null if the project does not exist.
+ */
+const getProjectStatusAndPending = async (projectId) => {
+  const query = `
+    SELECT
+      p.paused,
+      p.message_limit,
+      EXISTS (
+        SELECT 1 FROM project_tokens pt
+        JOIN tokens t ON t.id = pt.token_id
+        WHERE pt.project_id = p.id AND t.active
+      ) AS is_token_active,
+      COALESCE(
+        (SELECT json_agg(m.* ORDER BY m.created_at ASC)
+         FROM messages m
+         WHERE m.project_id = p.id AND m.status = 'pending'),
+        '[]'::json
+      ) AS pending
+    FROM projects p
+    WHERE p.id = $1;
+  `;
+  return await db.oneOrNone(query, [projectId]);
+};
+
 /**
  * [WATCHDOG/BRAIN] Gets all currently active projects.
  */
@@ -367,6 +397,34 @@ const getActiveProjects = async () => {
   return await db.any(query);
 };
 
+/**
+ * [WATCHDOG] Returns the active projects that should be paused, as rows of { id, reason, age_seconds }.
+ * A pending message older than pendingMinutes yields 'STUCK_QUEUE_TIMEOUT'; otherwise no activity
+ * for longer than idleMinutes yields 'IDLE_TIMEOUT'. Projects that are neither are not returned.
+ * Rows are keyset-paginated by id: pass the last id seen as afterId; a null limit returns all.
+ */
+const getStalledProjects = async (pendingMinutes, idleMinutes, afterId = 0, limit = null) => {
+  const query = `
+    SELECT p.id,
+      CASE WHEN op.oldest_pending < NOW() - $1 * INTERVAL '1 minute'
+        THEN 'STUCK_QUEUE_TIMEOUT' ELSE 'IDLE_TIMEOUT' END AS reason,
+      EXTRACT(EPOCH FROM NOW() - CASE WHEN op.oldest_pending < NOW() - $1 * INTERVAL '1 minute'
+        THEN op.oldest_pending ELSE p.last_activity_at END)::float AS age_seconds
+    FROM projects p
+    LEFT JOIN LATERAL (
+      SELECT MIN(m.created_at) AS oldest_pending FROM messages m
+      WHERE m.project_id = p.id AND m.status = 'pending'
+    ) op ON true
+    WHERE p.paused = false
+      AND (op.oldest_pending < NOW() - $1 * INTERVAL '1 minute'
+        OR p.last_activity_at < NOW() - $2 * INTERVAL '1 minute')
+      AND p.id > $3
+    ORDER BY p.id
+    LIMIT $4;
+  `;
+  return await db.any(query, [pendingMinutes, idleMinutes, afterId, limit]);
+};
+
 /**
  * Pauses a project from an internal source (like the watchdog) and broadcasts the change.
  * @param {number} projectId - The ID of the project to pause.
@@ -375,7 +433,7 @@ const getActiveProjects = async () => {
  */
 const pauseProjectInternal = async (projectId, code, message) => {
   // Use a transaction for database operations.
-  return db.tx(async t => {
+  await db.tx(async t => {
     // Pause the project in the database.
     await t.none(`UPDATE projects SET paused = true WHERE id = $1`, [projectId]);
 
@@ -388,6 +446,8 @@ const pauseProjectInternal = async (projectId, code, message) => {
     // Notify the frontend via WebSocket that the project state has changed.
     broadcastToProject(projectId, { type: 'project_updated', payload: { projectId } });
   });
+
+  notifyProjectEvent(projectId);
 };
 
 
@@ -400,6 +460,8 @@ module.exports = {
   updateProjectStatus,
   getProjectByIdInternal,
   getProjectFlags,
+  getProjectStatusAndPending,
   getActiveProjects,
+  getStalledProjects,
   pauseProjectInternal
 };
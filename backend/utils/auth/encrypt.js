@@ -3,36 +3,42 @@
 const crypto = require('crypto');
 const { encryptSecret } = require('../../env');
 
-const ALGORITHM = 'aes-256-cbc';
-const IV_LENGTH = 16; // AES block size
+const ALGORITHM = 'aes-256-gcm';
+const NONCE_LENGTH = 12; // Recommended GCM nonce size
+const LEGACY_ALGORITHM = 'aes-256-cbc'; // Tokens stored before the GCM switch
 
 // Validate secret key length
 if (!encryptSecret || encryptSecret.length !== 32) {
   throw new Error('ENCRYPT_SECRET must be exactly 32 characters.');
 }
 
-// Encrypt a string using AES-256-CBC
+const KEY = Buffer.from(encryptSecret, 'utf8');
+
+// Encrypt a string using AES-256-GCM: "nonce_hex:ciphertext_hex:tag_hex"
 const encrypt = (text) => {
-  const iv = crypto.randomBytes(IV_LENGTH);
-  const cipher = crypto.createCipheriv(
-    ALGORITHM,
-    Buffer.from(encryptSecret, 'utf8'),
-    iv
-  );
+  const nonce = crypto.randomBytes(NONCE_LENGTH);
+  const cipher = crypto.createCipheriv(ALGORITHM, KEY, nonce);
   let encrypted = cipher.update(text, 'utf8', 'hex');
   encrypted += cipher.final('hex');
-  return iv.toString('hex') + ':' + encrypted;
+  return nonce.toString('hex') + ':' + encrypted + ':' + cipher.getAuthTag().toString('hex');
 };
 
-// Decrypt a previously encrypted string
+// Decrypt a previously encrypted string (GCM, or legacy "iv_hex:data_hex" CBC)
 const decrypt = (encrypted) => {
-  const [ivHex, data] = encrypted.split(':');
+  const parts = encrypted.split(':');
+
+  if (parts.length === 3) {
+    const [nonceHex, data, tagHex] = parts;
+    const decipher = crypto.createDecipheriv(ALGORITHM, KEY, Buffer.from(nonceHex, 'hex'));
+    decipher.setAuthTag(Buffer.from(tagHex, 'hex'));
+    let decrypted = decipher.update(data, 'hex', 'utf8');
+    decrypted += decipher.final('utf8');
+    return decrypted;
+  }
+
+  const [ivHex, data] = parts;
   const iv = Buffer.from(ivHex, 'hex');
-  const decipher = crypto.createDecipheriv(
-    ALGORITHM,
-    Buffer.from(encryptSecret, 'utf8'),
-    iv
-  );
+  const decipher = crypto.createDecipheriv(LEGACY_ALGORITHM, KEY, iv);
   let decrypted = decipher.update(data, 'hex', 'utf8');
   decrypted += decipher.final('utf8');
   return decrypted;
@@ -5,8 +5,11 @@ import os
 from dotenv import load_dotenv
 
 # Load environment variables from the shared root .env file.
-env_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '.env'))
-load_dotenv(dotenv_path=env_path)
+# The sentinel is inherited by worker subprocesses so the file is only parsed once.
+if os.environ.get("_BRAIN_ENV_LOADED") != "1":
+    env_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '.env'))
+    load_dotenv(dotenv_path=env_path)
+    os.environ["_BRAIN_ENV_LOADED"] = "1"
 
 # Define essential environment variables required for the brain service.
 REQUIRED_KEYS = [
@@ -16,11 +19,18 @@ REQUIRED_KEYS = [
 ]
 
 # Check for any missing required environment variables and raise an error if found.
-missing = [key for key in REQUIRED_KEYS if not os.getenv(key)]
-if missing:
-    raise EnvironmentError(f"Missing required environment variables: {', '.join(missing)}")
+# A process whose parent already validated the (inherited) environment skips the check.
+env = os.environ
+if env.get("_BRAIN_ENV_VALIDATED") != "1":
+    missing = [key for key in REQUIRED_KEYS if not env.get(key)]
+    if missing:
+        raise EnvironmentError(f"Missing required environment variables: {', '.join(missing)}")
+    env["_BRAIN_ENV_VALIDATED"] = "1"
 
 # --- Configuration Values ---
-BACKEND_API_URL: str = os.getenv("BACKEND_API_URL")
-BRAIN_API_KEY: str = os.getenv("BRAIN_API_KEY")
-ENCRYPT_SECRET: str = os.getenv("ENCRYPT_SECRET")
\ No newline at end of file
+BACKEND_API_URL: str = env["BACKEND_API_URL"]
+BRAIN_API_KEY: str = env["BRAIN_API_KEY"]
+ENCRYPT_SECRET: str = env["ENCRYPT_SECRET"]
+
+# Optional: set BRAIN_FOREGROUND=1 to run nudged tasks inline (debugging); defaults to background tasks.
+BRAIN_FOREGROUND_MODE: bool = env.get("BRAIN_FOREGROUND", "0") == "1"
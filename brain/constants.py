@@ -33,7 +33,10 @@ Please reply using **exactly** this structure (as a real JSON object):
 - Do not include Markdown or code blocks
 - Only return one JSON object — nothing else
 - Avoid extra text or formatting
-"""
+""".strip()
+
+# Pre-built system message appended on each failed attempt (never mutated downstream).
+BREACH_NOTICE_MSG = {"role": "system", "content": BREACH_NOTICE}
 
 FFORMAT_RULES = """
 Respond using this strict JSON format:
@@ -48,19 +51,37 @@ Rules:
 - The object must be valid JSON
 """
 
-INVALID_AGENT_NOTICE = """
-[SYSTEM CORRECTION]: Your previous message contained an invalid agent name.
-The 'from' name must be your own assigned name, and the 'to' name must be one of the agents in this project.
-
-Invalid name detected: '{invalid_name}'
-Please correct the agent name in your JSON response and choose from the available agents: {valid_agent_names}.
-
-Resubmit your response with a valid agent name in the 'from' and 'to' fields.
-"""
-
 # Message History Window
 HISTORY_WINDOW_SIZE = 14
 MINIMUM_WINDOW_SIZE = 5
 
 # Project Handler Limits
-MAX_PROJECT_HANDLER_ITERATIONS = 100
\ No newline at end of file
+MAX_PROJECT_HANDLER_ITERATIONS = 100
+USE_COMBINED_STATUS_ENDPOINT = True  # Fetch flags + pending messages in one call; False restores the two-call path.
+MAX_CONCURRENT_MESSAGES = 8  # Upper bound on pending messages handled in parallel per iteration.
+USE_PROJECT_EVENT_LONG_POLL = True  # Wait on the backend's next-event endpoint instead of re-polling; falls back to one poll on error.
+PROJECT_EVENT_TIMEOUT_SECONDS = 2  # Short final wait for a follow-up message before the handler exits (never 0: the backend treats 0 as its default).
+
+# Batched Summarization
+USE_BATCH_SUMMARIZATION = False  # Queue summaries into OpenAI Batch API jobs (cheaper, but may take up to 24h to land).
+BATCH_POLL_INTERVAL_SECONDS = 60  # How often a submitted batch is checked for completion.
+
+# OpenAI Chat Request Batching
+CHAT_BATCH_MAX_SIZE = 16  # Max chat completions dispatched together in one window.
+CHAT_BATCH_MAX_WAIT_MS = 25  # How long a window stays open waiting for more concurrent requests.
+CHAT_BATCH_QUEUE_SIZE = 128  # Queued requests allowed before callers block (backpressure).
+RATE_LIMIT_MAX_RETRIES = 4  # Backoff retries on a transient 429 before TOKEN_EXHAUSTED is raised.
+RATE_LIMIT_MAX_BACKOFF_SECONDS = 30  # Cap on a single backoff delay.
+
+# Summary Cache
+SUMMARY_CACHE_MAX_ENTRIES = 128  # Cached summaries kept per project (least recently used are evicted).
+USE_SEMANTIC_SUMMARY_CACHE = False  # Also match near-duplicates by embedding similarity (needs numpy). Off: consecutive sliding windows look near-identical, so a hit would hide the newest messages, and every miss costs an embeddings call.
+SUMMARY_CACHE_SIMILARITY_THRESHOLD = 0.95  # Minimum cosine similarity for a semantic hit.
+SUMMARY_CACHE_EMBEDDING_MODEL = "text-embedding-3-small"
+SUMMARY_MAX_INPUT_TOKENS = 6000  # Token budget for the conversation extract sent to the summarizer (oldest messages are trimmed).
+SUMMARY_MIN_INPUT_TOKENS = 0  # Skip summarization below this many tokens. 0 = never skip: unsummarized messages fall out of the history window.
+
+# DB Log Writer
+LOG_QUEUE_MAX_SIZE = 1000  # Queued log entries before new ones are dropped to the console.
+LOG_BATCH_MAX_SIZE = 50  # Max entries sent in one bulk insert.
+LOG_FLUSH_INTERVAL_SECONDS = 0.5  # How long the writer waits to fill a batch.
\ No newline at end of file
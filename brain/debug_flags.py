@@ -1,41 +1,48 @@
 # FILE: brain/debug_flags.py
 # Purpose: Centralized control for enabling/disabling detailed debug logging across the AI Brain service.
+# Flags are fixed for the life of the process; call sites guard their log lines with `if debug:`
+# so disabled messages are never formatted.
+
+from typing import Final
 
 # === 🧠 Core ===
-debug_main = True
-debug_runner = True
-debug_config = False
-debug_constants = False
+debug_main: Final = True
+debug_runner: Final = True
+debug_config: Final = False
+debug_constants: Final = False
 
 # === 🧠 Cache ===
-debug_project_context_cache = False
+debug_project_context_cache: Final = False
+debug_summary_cache: Final = False
 
 # === 🧠 Handlers ===
-debug_message_handler = False  # Enable to log the message handling process
-debug_project_handler = True
-debug_format_checker = False
-debug_error_handler = False
-debug_summarizer = False  # Enable to see summarized context and prompts
+debug_message_handler: Final = False  # Enable to log the message handling process
+debug_project_handler: Final = True
+debug_format_checker: Final = False
+debug_error_handler: Final = False
+debug_summarizer: Final = False  # Enable to see summarized context and prompts
 
 # === 🧠 Services ===
-debug_openai_service = False  # Enable to log the prompt sent to OpenAI
-debug_conversation_service = False
-debug_logger_service = True
+debug_openai_service: Final = False  # Enable to log the prompt sent to OpenAI
+debug_openai_batch_service: Final = False
+debug_conversation_service: Final = False
+debug_logger_service: Final = True
 
 # === 🧠 DB Services ===
-debug_agents = False
-debug_conversations = False
-debug_logs = False
-debug_messages = False  # Enable to log message-specific actions (such as insertions)
-debug_projects = False
-debug_tokens = False
-debug_db_init = False
+debug_agents: Final = False
+debug_conversations: Final = False
+debug_logs: Final = False
+debug_messages: Final = False  # Enable to log message-specific actions (such as insertions)
+debug_projects: Final = False
+debug_tokens: Final = False
+debug_db_init: Final = False
 
 # === 🧠 Utils ===
-debug_console_log = True  # Enable to see general debug logs
-debug_crypto = False
-debug_retry = False
-debug_time = False
+debug_console_log: Final = True  # Enable to see general debug logs
+debug_crypto: Final = False
+debug_retry: Final = False
+debug_time: Final = False
+debug_token_count: Final = False
 
 # === 🛡️🐕 Watchdog ===
-debug_watchdog = False
\ No newline at end of file
+debug_watchdog: Final = False
\ No newline at end of file
@@ -2,10 +2,39 @@
 # Purpose: Parses and validates the structured JSON reply from the AI assistant.
 
 from debug_flags import debug_format_checker as debug
-import json
 from utils.console_log import log_console
 
+# Prefer orjson's C parser on the reply hot path; fall back to the stdlib if it isn't installed.
+try:
+    import orjson
+
+    def _loads(reply: str):
+        return orjson.loads(reply.encode() if isinstance(reply, str) else reply)
+except ImportError:
+    import json
+
+    _loads = json.loads
+
 REQUIRED_KEYS = ["from", "to", "body"]
+_REQUIRED = frozenset(REQUIRED_KEYS)
+
+def _extract_json_object(reply: str) -> str:
+    """
+    Strips Markdown code fences and any prose surrounding the outermost JSON object,
+    so replies like "```json {...} ```" parse on the first try instead of costing a retry.
+    """
+    s = reply.strip()
+    if s.startswith("```"):
+        # Drop the opening fence line (e.g. ```json) and a trailing closing fence.
+        s = s.split("\n", 1)[1] if "\n" in s else s[3:]
+        if s.rstrip().endswith("```"):
+            s = s.rstrip()[:-3]
+
+    lo = s.find("{")
+    hi = s.rfind("}")
+    if lo >= 0 and hi > lo:
+        s = s[lo:hi + 1]
+    return s
 
 def parse_assistant_reply(reply: str) -> dict | None:
     """
@@ -25,27 +54,37 @@ def parse_assistant_reply(reply: str) -> dict | None:
         dict | None: A dictionary with 'from', 'to', and 'content' keys if valid, otherwise None.
     """
     if not reply or not isinstance(reply, str):
-        log_console("⚠️ Assistant reply is missing or not a string", debug_flag=debug)
+        if debug:
+            log_console("⚠️ Assistant reply is missing or not a string")
         return None
 
     try:
-        data: dict = json.loads(reply)
-        if not all(key in data for key in REQUIRED_KEYS):
-            log_console(f"❌ Missing required keys in assistant reply: {data}", debug_flag=debug)
+        data: dict = _loads(_extract_json_object(reply))
+        if not isinstance(data, dict) or not data.keys() >= _REQUIRED:
+            if debug:
+                log_console(f"❌ Missing required keys in assistant reply: {data}")
+            return None
+
+        sender, recipient, body = data["from"], data["to"], data["body"]
+        if type(sender) is not str or type(recipient) is not str or type(body) is not str:
+            if debug:
+                log_console(f"❌ Non-string field in assistant reply: {data}")
             return None
 
+        # str.strip() hands back the same object when there is nothing to strip, so clean values cost no copy.
         result: dict = {
-            "from": data["from"].strip(),
-            "to": data["to"].strip(),
-            "content": data["body"].strip()
+            "from": sender.strip(),
+            "to": recipient.strip(),
+            "content": body.strip()
         }
 
-        log_console(f"✅ Parsed assistant reply: from={result['from']} to={result['to']}", debug_flag=debug)
+        if debug:
+            log_console(f"✅ Parsed assistant reply: from={result['from']} to={result['to']}")
         return result
 
-    except json.JSONDecodeError as e:
-        log_console(f"❌ JSON decode error in assistant reply: {e}", debug_flag=debug)
-    except Exception as e:
-        log_console(f"❌ Unexpected parsing error in assistant reply: {e}", debug_flag=debug)
+    except (ValueError, TypeError) as e:
+        # Both orjson's and the stdlib's JSONDecodeError subclass ValueError.
+        if debug:
+            log_console(f"❌ JSON decode error in assistant reply: {e}")
 
     return None
\ No newline at end of file
@@ -2,7 +2,7 @@
 # Purpose: Core message processing orchestrator for the AI agent system.
 
 from utils.console_log import log_console
-from constants import MAX_RETRIES, BREACH_NOTICE, INVALID_AGENT_NOTICE, HISTORY_WINDOW_SIZE, MINIMUM_WINDOW_SIZE
+from constants import MAX_RETRIES, BREACH_NOTICE_MSG, HISTORY_WINDOW_SIZE, MINIMUM_WINDOW_SIZE
 from services import openai_service, prompt_builder, api_client
 from services import logger_service
 from handlers.error_handler import handle_error
@@ -10,6 +10,14 @@ from handlers.format_checker import parse_assistant_reply
 from handlers.summarizer import summarize_agent_memory
 from debug_flags import debug_message_handler as debug
 
+def _clamp_history_window(message_count: int) -> int:
+    """Clamps an agent's message count into [MINIMUM_WINDOW_SIZE, HISTORY_WINDOW_SIZE] without min()/max() calls."""
+    return (
+        MINIMUM_WINDOW_SIZE if message_count < MINIMUM_WINDOW_SIZE
+        else HISTORY_WINDOW_SIZE if message_count > HISTORY_WINDOW_SIZE
+        else message_count
+    )
+
 async def handle_message(message: dict, context: dict) -> None:
     """
     Orchestrates the entire process of handling an incoming message for an AI agent.
@@ -32,8 +40,9 @@ async def handle_message(message: dict, context: dict) -> None:
         original_content: str = message["content"]
         retry_count: int = message.get("retry_count", 0)
 
-        log_console(f"📥 Handling message {message_id} from {original_sender_id} to {current_responding_agent_id}", debug_flag=debug)
-        log_console(f"↩️ Retry count for message {message_id}: {retry_count}", debug_flag=debug)
+        if debug:
+            log_console(f"📥 Handling message {message_id} from {original_sender_id} to {current_responding_agent_id}")
+            log_console(f"↩️ Retry count for message {message_id}: {retry_count}")
 
         # Pre-flight validation checks.
         api_key_for_openai: str | None = context.get("api_key")
@@ -45,11 +54,15 @@ async def handle_message(message: dict, context: dict) -> None:
 
         project_flags: dict = context.get("project_flags", {})
         if project_flags.get("paused"):
-            log_console(f"⏸️ Project {project_id} is paused. Skipping message.", debug_flag=debug)
+            if debug:
+                log_console(f"⏸️ Project {project_id} is paused. Skipping message.")
             return
 
         id_to_name_map: dict = context.get("id_to_name", {})
         name_to_id_map: dict = context.get("name_to_id", {})
+        # Bound lookups reused for every name resolution below.
+        names_get = id_to_name_map.get
+        ids_get = name_to_id_map.get
         responding_agent_context: dict | None = context.get("agents", {}).get(current_responding_agent_id)
         if not responding_agent_context:
             log_console(f"❌ Responding agent {current_responding_agent_id} not in context. Pausing.", "error")
@@ -58,16 +71,17 @@ async def handle_message(message: dict, context: dict) -> None:
             return
 
         # Context and prompt construction.
-        message_count_for_summary: int = responding_agent_context.get("message_count", 0)
-        history_fetch_count: int = min(HISTORY_WINDOW_SIZE, max(MINIMUM_WINDOW_SIZE, message_count_for_summary))
+        message_counts: dict = context["message_counts"]
+        message_count_for_summary: int = message_counts.get(current_responding_agent_id, 0)
+        history_fetch_count: int = _clamp_history_window(message_count_for_summary)
         recent_messages_db_rows: list = await api_client.get_agent_recent_messages(project_id, current_responding_agent_id, limit=history_fetch_count)
 
         summary: str | None = responding_agent_context.get("summary")
         project_overall_system_prompt: str = context.get("system_prompt", "")
         agent_specific_system_prompt: str = responding_agent_context.get("description", "")
         main_system_prompt_for_llm: str = prompt_builder.build_main_system_prompt(project_overall_system_prompt, agent_specific_system_prompt)
-        original_sender_name: str = id_to_name_map.get(original_sender_id, "UnknownSender")
-        current_responding_agent_name: str = id_to_name_map.get(current_responding_agent_id, "UnknownReceiver")
+        original_sender_name: str = names_get(original_sender_id, "UnknownSender")
+        current_responding_agent_name: str = names_get(current_responding_agent_id, "UnknownReceiver")
         formatted_trigger_message_content: str = f"[FROM: {original_sender_name} TO: {current_responding_agent_name}] {original_content.strip()}"
 
         base_llm_messages: list = prompt_builder.build_chat_prompt(
@@ -77,31 +91,34 @@ async def handle_message(message: dict, context: dict) -> None:
 
         model: str = responding_agent_context.get("model")
 
-        # Log prompt parts for debugging.
-        log_console("📤 Sending message with the following prompt parts:", level="info", debug_flag=debug)
-        log_console(f"• Summary:\n{summary or '[None]'}\n", level="info", debug_flag=debug)
-        log_console("• History:", debug_flag=debug)
-        for i, m in enumerate(recent_messages_db_rows, 1):
-            sender = id_to_name_map.get(m["sender_id"], "Unknown")
-            receiver = id_to_name_map.get(m.get("receiver_id"), "Unknown")
-            log_console(f"  {i}. [{sender} → {receiver}]: {m['content']}", level="info", debug_flag=debug)
-        log_console("• Trigger Message:\n" + formatted_trigger_message_content + "\n", level="info", debug_flag=debug)
+        # Log prompt parts for debugging (skipped entirely when debug is off).
+        if debug:
+            log_console("📤 Sending message with the following prompt parts:", level="info")
+            log_console(f"• Summary:\n{summary or '[None]'}\n", level="info")
+            log_console("• History:")
+            for i, m in enumerate(recent_messages_db_rows, 1):
+                sender = names_get(m["sender_id"], "Unknown")
+                receiver = names_get(m.get("receiver_id"), "Unknown")
+                log_console(f"  {i}. [{sender} → {receiver}]: {m['content']}", level="info")
+            log_console("• Trigger Message:\n" + formatted_trigger_message_content + "\n", level="info")
 
         # LLM interaction and retry loop for syntax validation.
         parsed_llm_response: dict | None = None
         assistant_reply_content: str = ""
         try:
             for attempt in range(retry_count + 1, MAX_RETRIES + 1):
+                # The service only reads the prompt, so the same list is reused across attempts.
                 assistant_reply_content = await openai_service.send_chat_completion(
-                    base_llm_messages.copy(), model=model, api_key=api_key_for_openai, project_id=project_id
+                    base_llm_messages, model=model, api_key=api_key_for_openai, project_id=project_id
                 )
                 parsed_llm_response = parse_assistant_reply(assistant_reply_content)
                 if parsed_llm_response:
                     break
 
                 await api_client.increment_message_retry_count(message_id)
-                log_console(f"❌ OpenAI response syntax validation failed on attempt {attempt}. Injecting correction notice.", "warn", debug_flag=debug)
-                base_llm_messages.append({"role": "system", "content": BREACH_NOTICE.strip()})
+                if debug:
+                    log_console(f"❌ OpenAI response syntax validation failed on attempt {attempt}. Injecting correction notice.", "warn")
+                base_llm_messages.append(BREACH_NOTICE_MSG)
         except Exception as e:
             error_code: str = str(e) if str(e) else "UNKNOWN_API_ERROR"
             log_message: str = f"Critical API/network error during LLM call for message {message_id}: {error_code}."
@@ -117,8 +134,8 @@ async def handle_message(message: dict, context: dict) -> None:
 
         actual_sender_name: str = parsed_llm_response["from"]
         actual_receiver_name: str = parsed_llm_response["to"]
-        actual_sender_id: int | None = name_to_id_map.get(actual_sender_name)
-        actual_receiver_id: int | None = name_to_id_map.get(actual_receiver_name)
+        actual_sender_id: int | None = ids_get(actual_sender_name)
+        actual_receiver_id: int | None = ids_get(actual_receiver_name)
 
         if not actual_sender_id or not actual_receiver_id:
             log_message = f"Project paused: AI responded with an invalid agent name ('{actual_sender_name}' or '{actual_receiver_name}')."
@@ -127,7 +144,10 @@ async def handle_message(message: dict, context: dict) -> None:
             await api_client.pause_project(project_id, "INVALID_AGENT_NAME")
             return
 
-        conv_key: tuple = tuple(sorted((actual_sender_id, actual_receiver_id)))
+        conv_key: tuple = (
+            (actual_sender_id, actual_receiver_id) if actual_sender_id < actual_receiver_id
+            else (actual_receiver_id, actual_sender_id)
+        )
         conversation_id_for_new_msg: int | None = context.get("conversations", {}).get(conv_key)
         if not conversation_id_for_new_msg:
             log_message = f"Project paused: Missing conversation for agents {actual_sender_name} <-> {actual_receiver_name}."
@@ -150,13 +170,18 @@ async def handle_message(message: dict, context: dict) -> None:
         await api_client.decrement_message_limit(project_id)
         await api_client.increment_agent_message_count(project_id, actual_sender_id)
 
-        log_console(f"✅ Assistant reply sent from {actual_sender_id} to {actual_receiver_id}", debug_flag=debug)
+        if debug:
+            log_console(f"✅ Assistant reply sent from {actual_sender_id} to {actual_receiver_id}")
 
         # Memory management: Update local memory and trigger summarization if active.
         if actual_sender_id in context["agents"]:
-            context["agents"][actual_sender_id]["message_count"] += 1
+            sender_message_count = message_counts[actual_sender_id] = message_counts.get(actual_sender_id, 0) + 1
 
-            if context["agents"][actual_sender_id]["message_count"] >= HISTORY_WINDOW_SIZE:
+            # Messages for one receiving agent are already handled in order (see project_handler);
+            # the guard also covers a reply whose "from" names another agent being summarized.
+            summarizing: set = context["summarizing_agents"]
+            if sender_message_count >= HISTORY_WINDOW_SIZE and actual_sender_id not in summarizing:
+                summarizing.add(actual_sender_id)
                 try:
                     await summarize_agent_memory(
                         project_id,
@@ -167,6 +192,8 @@ async def handle_message(message: dict, context: dict) -> None:
                 except Exception as e:
                     log_console(f"⚠️ Failed to summarize agent {actual_sender_id}: {e}", level="warn")
                     await logger_service.log_to_db(project_id, f"Failed to summarize agent {actual_sender_id}: {e}", "warn", "SUMMARY_FAILURE")
+                finally:
+                    summarizing.discard(actual_sender_id)
 
     except Exception as e:
         log_message: str = f"CRITICAL ERROR IN MESSAGE HANDLER for project {message.get('projectId')}: {e}"
@@ -3,37 +3,56 @@
 # This module orchestrates fetching messages, processing them via message_handler,
 # and managing the project's task queue.
 
+import asyncio
 from debug_flags import debug_project_handler as debug
 import json # Not explicitly used in this snippet but often for context/config
 from utils.console_log import log_console
-from constants import MAX_PROJECT_HANDLER_ITERATIONS
+from constants import (
+    MAX_PROJECT_HANDLER_ITERATIONS, MAX_CONCURRENT_MESSAGES, USE_COMBINED_STATUS_ENDPOINT,
+    USE_PROJECT_EVENT_LONG_POLL, PROJECT_EVENT_TIMEOUT_SECONDS, USE_BATCH_SUMMARIZATION,
+)
 from handlers.message_handler import handle_message
 from services import api_client # Still needed for non-logging API calls
 from services import logger_service # Import the dedicated logger service
+from services import openai_batch_service
 from utils.crypto import decrypt_token
+from operator import itemgetter
 
-async def handle_project(project_id: int) -> None:
+_get_id = itemgetter("id")
+_get_name = itemgetter("name")
+
+async def handle_project(project_id: int, on_work_picked_up=None) -> None:
     """
     Handles all pending tasks for a project. Fetches initial context,
     then loops to continually check project status and process messages.
 
     Args:
         project_id (int): The unique identifier for the project to process.
+        on_work_picked_up (callable, optional): Called whenever a status check returns
+            pending messages. Another check always follows, so earlier nudges are covered.
     """
+    # Low-importance (debug/info) DB logs are buffered here and flushed as one
+    # fire-and-forget batch per iteration; warn/error logs are still awaited directly.
+    pending_logs: list = []
+
+    def _queue_log(message: str, level: str = "debug", code: str | None = None) -> None:
+        pending_logs.append({"message": message, "level": level, "code": code})
+
+    def _flush_logs() -> None:
+        if pending_logs:
+            logger_service.fire_and_forget(logger_service.log_to_db_batch(project_id, pending_logs.copy()))
+            pending_logs.clear()
+
     # Log handler startup to console for immediate feedback.
-    log_console(f"🧠 Project handler starting for project {project_id}", debug_flag=debug)
+    if debug:
+        log_console(f"🧠 Project handler starting for project {project_id}")
     # Log to logger_service at debug level as it's internal initiation.
-    await logger_service.log_to_db(
-        project_id,
-        f"Project handler initiated for project {project_id}.",
-        level="debug",
-        code="PROJECT_HANDLER_START"
-    )
+    _queue_log(f"Project handler initiated for project {project_id}.", code="PROJECT_HANDLER_START")
 
     try:
         # Fetch the initial, comprehensive project context.
         project_context = await api_client.get_brain_context(project_id)
-        
+
         if not project_context:
             log_console(f"⚠️ Could not fetch context for project {project_id}. Exiting handler.", level="warn")
             await logger_service.log_to_db( # Log for persistent record
@@ -42,6 +61,7 @@ async def handle_project(project_id: int) -> None:
                 level="warn",
                 code="CONTEXT_FETCH_FAILED"
             )
+            _flush_logs()
             return
 
         # Decrypt the OpenAI API key.
@@ -61,40 +81,67 @@ async def handle_project(project_id: int) -> None:
                     code="DECRYPTION_FAILURE"
                 )
                 await api_client.pause_project(project_id, "DECRYPTION_FAILURE")
+                _flush_logs()
                 return
-        
+
         project_context["api_key"] = decrypted_api_key
         
         # Build helper maps from the initial context for efficient lookups.
         agents_list: list = project_context.get("agents", [])
-        agents_map: dict = {agent['id']: agent for agent in agents_list}
+        # map/zip over itemgetter iterate at C speed, without a Python frame per agent.
+        agent_ids: list = list(map(_get_id, agents_list))
+        agent_names: list = list(map(_get_name, agents_list))
+        agents_map: dict = dict(zip(agent_ids, agents_list))
+        name_to_id: dict = dict(zip(agent_names, agent_ids))
+        id_to_name: dict = dict(zip(agent_ids, agent_names))
+        message_counts: dict = {agent["id"]: agent.get("message_count", 0) for agent in agents_list}
         project_context['agents'] = agents_map
-        project_context['name_to_id'] = {data["name"]: aid for aid, data in agents_map.items()}
-        project_context['id_to_name'] = {aid: data["name"] for aid, data in agents_map.items()}
+        project_context['name_to_id'] = name_to_id
+        project_context['id_to_name'] = id_to_name
+        # Flat per-agent counters, updated on the hot path with a single lookup.
+        project_context['message_counts'] = message_counts
+        # Agents with a summarization in flight, so one agent is never summarized twice at once.
+        project_context['summarizing_agents'] = set()
         
         conversations_list: list = project_context.get("conversations", [])
         conversation_map: dict = {}
         for conv in conversations_list:
-            key = tuple(sorted((conv["sender_id"], conv["receiver_id"])))
+            a, b = conv["sender_id"], conv["receiver_id"]
+            key = (a, b) if a < b else (b, a)
             conversation_map[key] = conv["id"]
         project_context['conversations'] = conversation_map
 
-        log_console(f"🧠 Context built for project {project_id}: {len(agents_map)} agents, {len(conversation_map)} conversations", debug_flag=debug)
-        await logger_service.log_to_db( # Log context building details at debug level.
-            project_id,
+        if debug:
+            log_console(f"🧠 Context built for project {project_id}: {len(agents_map)} agents, {len(conversation_map)} conversations")
+        _queue_log( # Log context building details at debug level.
             f"Context built: {len(agents_map)} agents, {len(conversation_map)} conversations.",
-            level="debug",
             code="CONTEXT_BUILD_SUCCESS"
         )
 
-
         # Main processing loop.
         iteration = 0
         while iteration < MAX_PROJECT_HANDLER_ITERATIONS:
             iteration += 1
 
             # Check project status and message limit at the start of each iteration.
-            flags: dict = await api_client.get_project_flags(project_id)
+            pending_messages: list | None = None
+            if USE_PROJECT_EVENT_LONG_POLL and iteration > 1:
+                # Checks after the first block briefly server-side until a message is pending (or the
+                # project stops), so replies that land just after a pass are picked up without re-polling.
+                # The wait is short: once the queue is empty the handler exits instead of lingering.
+                try:
+                    status: dict = await api_client.await_next_project_event(project_id, PROJECT_EVENT_TIMEOUT_SECONDS) or {}
+                except Exception as e:
+                    log_console(f"⚠️ Long-poll failed for project {project_id}, falling back to a status poll: {e}", level="warn")
+                    status = await api_client.get_project_status_and_pending(project_id) or {}
+                flags: dict = status.get("flags", {})
+                pending_messages = status.get("pending", [])
+            elif USE_COMBINED_STATUS_ENDPOINT or USE_PROJECT_EVENT_LONG_POLL:
+                status: dict = await api_client.get_project_status_and_pending(project_id) or {}
+                flags: dict = status.get("flags", {})
+                pending_messages = status.get("pending", [])
+            else:
+                flags: dict = await api_client.get_project_flags(project_id)
             project_context["project_flags"] = flags
 
             # --- FIX: Check for both paused status and active token status ---
@@ -128,27 +175,40 @@ async def handle_project(project_id: int) -> None:
                 )
                 break
 
-            pending_messages: list = await api_client.get_pending_messages(project_id)
+            if pending_messages is None:
+                pending_messages = await api_client.get_pending_messages(project_id)
             if not pending_messages:
-                log_console(f"✅ No more pending messages for project {project_id}. Handler exiting loop.", debug_flag=debug)
-                await logger_service.log_to_db(
-                    project_id,
-                    "Project has no more pending messages. Handler exiting gracefully.",
-                    level="debug",
-                    code="NO_PENDING_MESSAGES"
-                )
+                if debug:
+                    log_console(f"✅ No more pending messages for project {project_id}. Handler exiting loop.")
+                _queue_log("Project has no more pending messages. Handler exiting gracefully.", code="NO_PENDING_MESSAGES")
                 break
 
-            log_console(f"📬 Found {len(pending_messages)} pending message(s) (Iteration {iteration}). Processing...", debug_flag=debug)
-            await logger_service.log_to_db(
-                project_id,
-                f"Processing {len(pending_messages)} pending message(s) in iteration {iteration}.",
-                level="debug",
-                code="MESSAGES_FOUND"
-            )
+            if on_work_picked_up is not None:
+                on_work_picked_up()
+
+            if debug:
+                log_console(f"📬 Found {len(pending_messages)} pending message(s) (Iteration {iteration}). Processing...")
+            _queue_log(f"Processing {len(pending_messages)} pending message(s) in iteration {iteration}.", code="MESSAGES_FOUND")
 
+            # Each reply builds on its agent's history (and may trigger that agent's summary), so
+            # messages for the same receiving agent are handled in order; different agents are
+            # overlapped, bounded by a semaphore.
+            semaphore = asyncio.Semaphore(MAX_CONCURRENT_MESSAGES)
+            messages_by_receiver: dict = {}
             for message in pending_messages:
-                await handle_message(message, project_context)
+                messages_by_receiver.setdefault(message["receiverId"], []).append(message)
+
+            async def _run_in_order(messages: list) -> None:
+                for message in messages:
+                    async with semaphore:
+                        await handle_message(message, project_context)
+
+            await asyncio.gather(*(_run_in_order(group) for group in messages_by_receiver.values()), return_exceptions=True)
+            _flush_logs()
+
+        # Submit any summaries queued during this run as a single batch job.
+        if USE_BATCH_SUMMARIZATION:
+            await openai_batch_service.flush()
 
         # Log warning if max iterations are reached.
         if iteration >= MAX_PROJECT_HANDLER_ITERATIONS:
@@ -174,10 +234,7 @@ async def handle_project(project_id: int) -> None:
         await api_client.pause_project(project_id, "HANDLER_CRASH")
 
     # Final log entry upon completion or early exit.
-    log_console(f"✅ Project handler finished for project {project_id}.", debug_flag=debug)
-    await logger_service.log_to_db(
-        project_id,
-        f"Project handler finished execution for project {project_id}.",
-        level="debug",
-        code="PROJECT_HANDLER_END"
-    )
+    if debug:
+        log_console(f"✅ Project handler finished for project {project_id}.")
+    _queue_log(f"Project handler finished execution for project {project_id}.", code="PROJECT_HANDLER_END")
+    _flush_logs()
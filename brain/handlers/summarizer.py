@@ -2,9 +2,14 @@
 # Purpose: Handles the summarization of recent agent memory using the OpenAI service.
 
 from debug_flags import debug_summarizer as debug
-from services import api_client # Still needed for get_agent_recent_messages and save_summary
+from services import api_client # Still needed for get_agent_summarization_context and save_summary
 from services import openai_service
+from services import openai_batch_service
+from constants import USE_BATCH_SUMMARIZATION, SUMMARY_MAX_INPUT_TOKENS, SUMMARY_MIN_INPUT_TOKENS
+from utils.tokens import take_within_token_budget
 from services import logger_service # Import logger_service for persistent logging
+from services import summary_cache
+from services.prompt_builder import display_name
 from utils.console_log import log_console
 
 async def summarize_agent_memory(project_id: int, agent_id_to_summarize_for: int, api_key: str, id_to_name_map: dict) -> None:
@@ -18,71 +23,100 @@ async def summarize_agent_memory(project_id: int, agent_id_to_summarize_for: int
         id_to_name_map (dict): A map of {agent_id: agent_name}.
     """
     try:
-        log_console(
-            f"🧠 Triggering summarization for agent {agent_id_to_summarize_for} "
-            f"(Name: {id_to_name_map.get(agent_id_to_summarize_for, 'Unknown')}) in project {project_id}",
-            debug_flag=debug
-        )
-        await logger_service.log_to_db( # Log initiation of summarization for persistent record
+        if debug:
+            log_console(
+                f"🧠 Triggering summarization for agent {agent_id_to_summarize_for} "
+                f"(Name: {id_to_name_map.get(agent_id_to_summarize_for, 'Unknown')}) in project {project_id}"
+            )
+        logger_service.fire_and_forget(logger_service.log_to_db( # Informational; not awaited
             project_id,
             f"Initiating summarization for agent {agent_id_to_summarize_for}.",
             level="debug",
             code="SUMMARIZATION_INITIATED"
-        )
+        ))
 
-        # 1. Fetch recent messages for the agent.
-        recent_message_db_rows = await api_client.get_agent_recent_messages(
+        # 1. Fetch the agent's recent messages and current summary in one request.
+        summarization_context = await api_client.get_agent_summarization_context(
             project_id, agent_id_to_summarize_for, limit=20
-        )
+        ) or {}
+        recent_message_db_rows = summarization_context.get("recent")
+        last_summary = summarization_context.get("last_summary")
 
         if not recent_message_db_rows:
-            log_console(
-                f"⚠️ No recent messages to summarize for agent {agent_id_to_summarize_for}.",
-                debug_flag=debug
-            )
-            await logger_service.log_to_db( # Log if no messages found for persistent record
+            if debug:
+                log_console(
+                    f"⚠️ No recent messages to summarize for agent {agent_id_to_summarize_for}."
+                )
+            logger_service.fire_and_forget(logger_service.log_to_db( # Informational; not awaited
                 project_id,
                 f"No recent messages found for summarization for agent {agent_id_to_summarize_for}.",
                 level="debug",
                 code="NO_MESSAGES_TO_SUMMARIZE"
-            )
+            ))
             return
 
         # 2. Format messages for summarization by OpenAI.
-        conversation_text_for_summary = []
-        for msg_row in recent_message_db_rows:
-            sender_name = id_to_name_map.get(msg_row["sender_id"], "UnknownSender")
-            receiver_name = id_to_name_map.get(msg_row.get("receiver_id"), "UnknownReceiver")
-            conversation_text_for_summary.append(
-                f"[{sender_name} to {receiver_name}]: {msg_row['content'].strip()}"
-            )
+        conversation_lines = [
+            f"[{display_name(id_to_name_map, msg_row['sender_id'], 'UnknownSender')} to "
+            f"{display_name(id_to_name_map, msg_row.get('receiver_id'), 'UnknownReceiver')}]: "
+            f"{msg_row['content'].strip()}"
+            for msg_row in recent_message_db_rows
+        ]
+        # Rows arrive newest first, so trimming to the token budget drops the oldest messages.
+        # The newest message is always kept, even if it alone is over budget.
+        kept_lines, conversation_tokens = take_within_token_budget(conversation_lines, SUMMARY_MAX_INPUT_TOKENS)
+        conversation_lines = kept_lines or conversation_lines[:1]
+        if conversation_tokens < SUMMARY_MIN_INPUT_TOKENS:
+            if debug:
+                log_console(
+                    f"⚠️ Only {conversation_tokens} tokens to summarize for agent {agent_id_to_summarize_for}; skipping."
+                )
+            return
+        full_conversation_str = "\n\n".join(conversation_lines)
 
-        full_conversation_str = "\n\n".join(conversation_text_for_summary)
+        # Carry the previous summary forward so facts older than the fetched window aren't lost.
+        summarizer_request_content = f"Please summarize the following conversation extract:\n\n{full_conversation_str}"
+        if last_summary:
+            summarizer_request_content = f"Previous summary:\n{last_summary.strip()}\n\n{summarizer_request_content}"
         messages_for_openai_summarizer = [
             {
                 "role": "user",
-                "content": f"Please summarize the following conversation extract:\n\n{full_conversation_str}"
+                "content": summarizer_request_content
             }
         ]
 
         log_console(
-            f"📝 Preview of content being sent for summarization:\n{full_conversation_str[:500]}...",
+            lambda: f"📝 Preview of content being sent for summarization:\n{full_conversation_str[:500]}...",
             debug_flag=debug
         )
 
+        # 3a. Batched mode: hand the request to the batch service, which saves the summary later.
+        if USE_BATCH_SUMMARIZATION:
+            openai_batch_service.enqueue_summary(
+                project_id, agent_id_to_summarize_for, messages_for_openai_summarizer, api_key
+            )
+            return
+
         # 3. Generate summary using OpenAI service.
-        generated_summary = await openai_service.summarize_messages(
-            messages_to_summarize=messages_for_openai_summarizer,
-            api_key=api_key,
-            project_id=project_id # Pass project_id for openai_service's own logging
+        #    Repeated or near-identical conversation extracts are served from the summary cache.
+        generated_summary = await summary_cache.get_or_summarize(
+            project_id,
+            agent_id_to_summarize_for,
+            full_conversation_str,
+            api_key,
+            lambda: openai_service.summarize_messages(
+                messages_to_summarize=messages_for_openai_summarizer,
+                api_key=api_key,
+                project_id=project_id # Pass project_id for openai_service's own logging
+            )
         )
 
         if not generated_summary:
-            log_console(
-                f"⚠️ Summarization for agent {agent_id_to_summarize_for} returned an empty result.",
-                level="warn",
-                debug_flag=debug
-            )
+            if debug:
+                log_console(
+                    f"⚠️ Summarization for agent {agent_id_to_summarize_for} returned an empty result.",
+                    level="warn"
+                )
             await logger_service.log_to_db( # Log empty summary for persistent record
                 project_id,
                 f"Summarization for agent {agent_id_to_summarize_for} returned an empty result.",
@@ -113,16 +147,16 @@ async def summarize_agent_memory(project_id: int, agent_id_to_summarize_for: int
             "historyJson": None # Assuming historyJson is intentionally None here.
         })
 
-        log_console(
-            f"✅ Summary saved for agent {agent_id_to_summarize_for}: '{generated_summary[:100]}...'",
-            debug_flag=debug
-        )
-        await logger_service.log_to_db( # Log successful save for persistent record
+        if debug:
+            log_console(
+                f"✅ Summary saved for agent {agent_id_to_summarize_for}: '{generated_summary[:100]}...'"
+            )
+        logger_service.fire_and_forget(logger_service.log_to_db( # Informational; not awaited
             project_id,
             f"Summary successfully saved for agent {agent_id_to_summarize_for}.",
             level="debug", # Can be info/debug depending on desired verbosity for system events
             code="SUMMARY_SAVED"
-        )
+        ))
 
     except Exception as e:
         log_console(
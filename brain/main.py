@@ -3,20 +3,33 @@
 # It acts as the primary API interface, receiving "nudges" to process project tasks.
 
 import uvicorn
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException, BackgroundTasks
 from pydantic import BaseModel
 
+from config import BRAIN_FOREGROUND_MODE
 from utils.console_log import log_console
 from runner import process_project_tasks
+from services import openai_service
+from services import logger_service
 
 # Toggle between foreground (debug/development) and background (production) task execution.
-USE_FOREGROUND_MODE = True  # Set to False for production deployments.
+# Foreground mode holds the request open for the whole run, so it is opt-in via BRAIN_FOREGROUND=1.
+USE_FOREGROUND_MODE = BRAIN_FOREGROUND_MODE
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Runs on server startup/shutdown; flushes queued DB logs and closes the cached OpenAI clients on the way out."""
+    yield
+    await logger_service.flush_logs()
+    await openai_service.close_clients()
 
 # Initialize the FastAPI application.
 app = FastAPI(
     title="AI Worker Brain",
     description="Receives nudges to process tasks for AI agent projects.",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Pydantic model for the incoming 'nudge' request.
@@ -7,6 +7,11 @@ from handlers.project_handler import handle_project # Core handler for processin
 from utils.console_log import log_console # Centralized console logging utility.
 from services import logger_service # Import logger_service for persistent error logging.
 
+# Projects with a running handler, mapped to whether another nudge arrived while it was running.
+# Duplicate nudges are folded into one extra pass, which is skipped if the running handler
+# has since fetched the pending work itself.
+_ACTIVE_PROJECTS: dict[int, bool] = {}
+
 async def process_project_tasks(project_id: int):
     """
     Main entry point for processing all pending tasks associated with a specific project ID.
@@ -17,9 +22,25 @@ async def process_project_tasks(project_id: int):
     Args:
         project_id (int): The unique identifier for the project to be processed.
     """
+    if project_id in _ACTIVE_PROJECTS:
+        _ACTIVE_PROJECTS[project_id] = True
+        log_console(f"🔁 Project {project_id} already has a running handler; queued another pass.", debug_flag=debug_runner)
+        return
+
+    _ACTIVE_PROJECTS[project_id] = False
+
+    def _clear_repass() -> None:
+        # The handler found pending work and will check again before exiting, so any nudge
+        # received so far is covered by the current run.
+        _ACTIVE_PROJECTS[project_id] = False
+
     try:
         log_console(f"🏃‍♂️ Runner starting work for project {project_id}...", debug_flag=debug_runner)
-        await handle_project(project_id)
+        while True:
+            await handle_project(project_id, on_work_picked_up=_clear_repass)
+            if not _ACTIVE_PROJECTS[project_id]:
+                break
+            _ACTIVE_PROJECTS[project_id] = False
         log_console(f"✅ Runner finished work for project {project_id}.", debug_flag=debug_runner)
     except Exception as e:
         # Catch any catastrophic, unhandled exceptions to prevent silent crashes.
@@ -32,4 +53,6 @@ async def process_project_tasks(project_id: int):
             f"Critical error in runner: {e}",
             level="error",
             code="RUNNER_CRASH"
-        )
\ No newline at end of file
+        )
+    finally:
+        del _ACTIVE_PROJECTS[project_id]
\ No newline at end of file
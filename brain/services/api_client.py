@@ -2,9 +2,24 @@
 # Purpose: Centralized client for all HTTP communication from brain and watchdog services to the backend API.
 
 import httpx
+from collections.abc import AsyncIterator
 from config import BACKEND_API_URL, BRAIN_API_KEY
 from utils.console_log import log_console
 
+# Serialize request bodies and parse responses with orjson's C codec when available.
+try:
+    import orjson
+
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+except ImportError:
+    import json
+
+    def _dumps(payload) -> bytes:
+        return json.dumps(payload).encode()
+
+    _loads = json.loads
+
 # Initialize a reusable asynchronous HTTP client.
 client = httpx.AsyncClient(
     base_url=BACKEND_API_URL, # Base URL for all API requests.
@@ -22,7 +37,9 @@ async def _make_request(method: str, endpoint: str, **kwargs) -> dict | None:
     Args:
         method (str): The HTTP method (e.g., 'GET', 'POST').
         endpoint (str): The API endpoint path (e.g., '/projects/1').
-        **kwargs: Additional arguments for `httpx.AsyncClient.request`.
+        **kwargs: Additional arguments for `httpx.AsyncClient.request`. A `json=` body is
+            pre-serialized here and sent as `content=` (the client already sends
+            `Content-Type: application/json`).
 
     Returns:
         dict | None: Parsed JSON response, or `None` if status is 204 (No Content).
@@ -31,6 +48,9 @@ async def _make_request(method: str, endpoint: str, **kwargs) -> dict | None:
         httpx.HTTPStatusError: For 4xx or 5xx HTTP responses.
         httpx.RequestError: For network-level errors.
     """
+    if "json" in kwargs:
+        kwargs["content"] = _dumps(kwargs.pop("json"))
+
     try:
         log_console(f"API Client: Sending {method} request to {endpoint}", level="debug")
         response = await client.request(method, endpoint, **kwargs)
@@ -39,7 +59,7 @@ async def _make_request(method: str, endpoint: str, **kwargs) -> dict | None:
         if response.status_code == 204: # No content for 204 status.
             return None
         
-        return response.json()
+        return _loads(response.content)
         
     except httpx.HTTPStatusError as e:
         log_console(f"API Error: {e.response.status_code} calling {e.request.method} {e.request.url}", level="error")
@@ -76,6 +96,10 @@ async def create_log_entry(payload: dict) -> dict | None:
     """Creates a new log entry in the database via the backend API."""
     return await _make_request("POST", "/logs", json=payload)
 
+async def create_log_entries_batch(entries: list) -> dict | None:
+    """Creates several log entries in the database with a single backend request."""
+    return await _make_request("POST", "/logs/batch", json={"entries": entries})
+
 async def save_summary(payload: dict) -> dict | None:
     """Saves a new agent memory summary to the backend."""
     return await _make_request("POST", "/summaries", json=payload)
@@ -88,19 +112,55 @@ async def get_project_flags(project_id: int) -> dict | None:
     """Retrieves a project's live status flags and dynamic settings (e.g., `is_paused`)."""
     return await _make_request("GET", f"/projects/{project_id}/flags")
 
+async def get_project_status_and_pending(project_id: int) -> dict | None:
+    """Retrieves a project's flags and its pending messages in one request: `{"flags": {...}, "pending": [...]}`."""
+    return await _make_request("GET", f"/projects/{project_id}/status")
+
+async def await_next_project_event(project_id: int, timeout: int) -> dict | None:
+    """
+    Long-polls the backend until the project has pending messages, is paused, or `timeout` seconds pass.
+
+    Returns the same `{"flags": {...}, "pending": [...]}` shape as `get_project_status_and_pending`.
+    """
+    return await _make_request(
+        "GET",
+        f"/projects/{project_id}/next-event?timeout={timeout}",
+        timeout=timeout + 15.0, # The HTTP timeout must outlast the server-side wait.
+    )
+
 async def get_agent_recent_messages(project_id: int, agent_id: int, limit: int = 20) -> list | None:
     """Fetches recent messages for a given agent (sender or receiver)."""
     return await _make_request("GET", f"/agents/{project_id}/{agent_id}/messages?limit={limit}")
 
+async def get_agent_summarization_context(project_id: int, agent_id: int, limit: int = 20) -> dict | None:
+    """Fetches an agent's current summary and recent messages together: `{"last_summary": str | None, "recent": [...]}`."""
+    return await _make_request("GET", f"/agents/{project_id}/{agent_id}/summarization-context?limit={limit}")
+
 # --- Watchdog Functions ---
 
-async def get_active_projects() -> list | None:
-    """Retrieves a list of all active projects from the backend."""
-    return await _make_request("GET", "/projects/active")
+async def iter_stalled_projects(pending_minutes: float, idle_minutes: float, page_size: int = 500) -> AsyncIterator[list]:
+    """
+    Yields the active projects the watchdog should pause, filtered server-side, one
+    keyset-paginated page at a time so only a single page is held in memory.
+    `page_size` must not exceed the backend's cap of 500 rows per page.
 
-async def get_oldest_pending_message_timestamp(project_id: int) -> dict | None:
-    """Retrieves the timestamp of the oldest 'pending' message for a project."""
-    return await _make_request("GET", f"/projects/{project_id}/oldest-pending")
+    Yields:
+        list: (project_id, reason_code, age_seconds) tuples ordered by project id, where
+        reason_code is "STUCK_QUEUE_TIMEOUT" or "IDLE_TIMEOUT".
+    """
+    after_id = 0
+    while True:
+        rows = await _make_request(
+            "GET",
+            f"/projects/stalled?pendingMinutes={pending_minutes}&idleMinutes={idle_minutes}"
+            f"&afterId={after_id}&limit={page_size}"
+        ) or []
+        if not rows:
+            return
+        yield [(row["id"], row["reason"], row["age_seconds"]) for row in rows]
+        if len(rows) < page_size:
+            return
+        after_id = rows[-1]["id"]
 
 async def pause_project(project_id: int, reason_code: str) -> dict | None:
     """Instructs the backend API to pause a specific project with a reason code."""
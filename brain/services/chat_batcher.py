@@ -0,0 +1,91 @@
+# FILE: brain/services/chat_batcher.py
+# Purpose: Coalesces concurrent chat-completion calls into short dispatch windows so they
+#          go out together over the shared OpenAI connection pool, with a bounded queue for backpressure.
+
+import asyncio
+
+from debug_flags import debug_openai_service as debug
+from utils.console_log import log_console
+
+class ChatBatcher:
+    """
+    Collects chat-completion requests for up to `max_wait_ms` (or `max_batch` requests)
+    and dispatches each window concurrently. Every request is still its own API call.
+
+    Args:
+        get_client: Callable returning the shared AsyncOpenAI client for an API key.
+        max_batch (int): Maximum requests dispatched in one window.
+        max_wait_ms (int): How long the first request in a window waits for company.
+        queue_size (int): Pending requests allowed before `submit` blocks callers.
+    """
+
+    def __init__(self, get_client, max_batch: int = 16, max_wait_ms: int = 25, queue_size: int = 128):
+        self._get_client = get_client
+        self._max_batch = max_batch
+        self._max_wait = max_wait_ms / 1000
+        self._queue_size = queue_size
+        self._queue: asyncio.Queue | None = None
+        self._worker: asyncio.Task | None = None
+        self._dispatches: set = set()
+
+    async def submit(self, api_key: str, request_kwargs: dict):
+        """
+        Queues one `chat.completions.create` call and waits for its response.
+
+        Raises:
+            Whatever the underlying OpenAI call raised, unchanged.
+        """
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue(maxsize=self._queue_size)
+            self._worker = asyncio.create_task(self._run())
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((api_key, request_kwargs, future))
+        return await future
+
+    async def close(self) -> None:
+        """Stops the dispatch worker. Requests already dispatched are left to finish."""
+        if self._worker is not None:
+            self._worker.cancel()
+            self._worker = None
+
+    async def _run(self) -> None:
+        """Drains the queue one window at a time."""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self._max_wait
+            try:
+                async with asyncio.timeout_at(deadline):
+                    while len(batch) < self._max_batch:
+                        batch.append(await self._queue.get())
+            except TimeoutError:
+                pass
+
+            if debug:
+                log_console(f"📨 Dispatching {len(batch)} chat completion request(s)", debug_flag=debug)
+            # Dispatch in the background so the next window can fill while this one is in flight.
+            dispatch = asyncio.create_task(self._dispatch(batch))
+            self._dispatches.add(dispatch)
+            dispatch.add_done_callback(self._dispatches.discard)
+
+    async def _dispatch(self, batch: list) -> None:
+        """Sends every request in the window concurrently; each resolves its own caller's future."""
+        try:
+            await asyncio.gather(*(self._send_one(api_key, kwargs, future) for api_key, kwargs, future in batch))
+        finally:
+            # Nothing may leave a caller waiting forever, even if the dispatch itself is cancelled.
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(RuntimeError("Chat completion dispatch ended before a response was received."))
+
+    async def _send_one(self, api_key: str, kwargs: dict, future: asyncio.Future) -> None:
+        """Makes one API call, routing its result or error (including synchronous ones) to the caller's future."""
+        try:
+            result = await self._get_client(api_key).chat.completions.create(**kwargs)
+        except Exception as e:
+            if not future.done():  # Caller may have been cancelled while waiting.
+                future.set_exception(e)
+            return
+        if not future.done():
+            future.set_result(result)
@@ -1,18 +1,27 @@
 # FILE: brain/services/logger_service.py
 # Purpose: Centralized service for sending structured log entries to the backend API.
 
+import asyncio
 from services import api_client
 from utils.console_log import log_console
 from debug_flags import debug_logger_service as debug
+from constants import LOG_QUEUE_MAX_SIZE, LOG_BATCH_MAX_SIZE, LOG_FLUSH_INTERVAL_SECONDS
+
+# Log entries wait here and are written by a single background worker in bulk inserts.
+# The queue is created together with its worker, so each event loop (e.g. each `asyncio.run`)
+# gets its own pair instead of a queue bound to a loop that is gone.
+_log_queue: asyncio.Queue | None = None
+_log_worker: asyncio.Task | None = None
+_STOP = object() # Queued by flush_logs to make the worker send its partial batch and exit.
 
 async def log_to_db(project_id: int, message: str, level: str = "error", code: str | None = None) -> None:
     """
-    Sends a structured log entry to the backend via the API client.
+    Queues a structured log entry for the backend; returns without waiting on the network.
 
     This function acts as the standard logging utility for persistent, database-stored logs.
-    It replaces direct database insertions. If the API call to the backend fails, it falls
-    back to logging the error and the original message to the console to prevent the log
-    from being lost entirely.
+    A background worker drains the queue and inserts entries in batches. If the queue is full
+    or a batch fails to send, the entries are logged to the console instead, so they are not
+    lost entirely.
 
     Args:
         project_id (int): The ID of the project this log is associated with.
@@ -20,19 +29,123 @@ async def log_to_db(project_id: int, message: str, level: str = "error", code: s
         level (str, optional): The log severity (e.g., 'info', 'warn', 'error'). Defaults to "error".
         code (str | None, optional): An optional machine-readable code (e.g., 'TOKEN_EXHAUSTED'). Defaults to None.
     """
+    _enqueue({
+        "projectId": project_id,
+        "message": message,
+        "level": level,
+        "code": code
+    })
+
+def _enqueue(payload: dict) -> None:
+    """Puts one log payload on the queue, starting the worker on first use."""
+    global _log_queue, _log_worker
+    if _log_worker is None or _log_worker.done():
+        previous_queue = _log_queue
+        _log_queue = asyncio.Queue(maxsize=LOG_QUEUE_MAX_SIZE)
+        # Carry over anything a worker that died (or whose loop closed) left unsent.
+        while previous_queue is not None and not previous_queue.empty():
+            item = previous_queue.get_nowait()
+            if item is not _STOP:
+                _log_queue.put_nowait(item)
+        _log_worker = asyncio.create_task(_run_log_worker(_log_queue))
+
     try:
-        log_console(f"Logger: Sending log to backend for project {project_id}", debug_flag=debug)
-        
-        payload = {
-            "projectId": project_id,
-            "message": message,
-            "level": level,
-            "code": code
-        }
-        
-        await api_client.create_log_entry(payload)
+        _log_queue.put_nowait(payload)
+    except asyncio.QueueFull:
+        log_console("Logger: Log queue is full; dropping entry to console.", level="warn", debug_flag=True)
+        _log_payloads_to_console([payload])
 
+async def _run_log_worker(queue: asyncio.Queue) -> None:
+    """
+    Collects up to LOG_BATCH_MAX_SIZE entries (or waits LOG_FLUSH_INTERVAL_SECONDS) and sends them as one batch.
+    If cancelled (e.g. by `asyncio.run` shutting down), sends the partial batch and anything still queued, then returns.
+    """
+    loop = asyncio.get_running_loop()
+    batch = []
+    try:
+        while True:
+            item = await queue.get() # Idle until there is something to send.
+            if item is _STOP:
+                return
+            batch.append(item)
+            stopping = False
+            try:
+                async with asyncio.timeout_at(loop.time() + LOG_FLUSH_INTERVAL_SECONDS):
+                    while len(batch) < LOG_BATCH_MAX_SIZE:
+                        item = await queue.get()
+                        if item is _STOP:
+                            stopping = True
+                            break
+                        batch.append(item)
+            except TimeoutError:
+                pass
+            await _send_batch(batch)
+            batch = [] # Cleared only once sent, so a cancelled send is retried below.
+            if stopping:
+                return
+    except asyncio.CancelledError:
+        while not queue.empty():
+            item = queue.get_nowait()
+            if item is not _STOP:
+                batch.append(item)
+        if batch:
+            await _send_batch(batch)
+
+async def _send_batch(batch: list) -> None:
+    """Sends one batch of log payloads, falling back to the console on failure."""
+    try:
+        log_console(f"Logger: Sending {len(batch)} log(s) to backend", debug_flag=debug)
+        await api_client.create_log_entries_batch(batch)
     except Exception as e:
         # CRITICAL FALLBACK: If API logging fails, log to console to prevent data loss.
-        log_console(f"CRITICAL: Failed to send log to backend API. Error: {e}", level="error")
-        log_console(f"Original Log Message: [Project {project_id}] [{level.upper()}] {message}", level="error")
\ No newline at end of file
+        log_console(f"CRITICAL: Failed to send log batch to backend API. Error: {e}", level="error")
+        _log_payloads_to_console(batch)
+
+def _log_payloads_to_console(payloads: list) -> None:
+    for payload in payloads:
+        log_console(f"Original Log Message: [Project {payload['projectId']}] [{(payload['level'] or 'error').upper()}] {payload['message']}", level="error")
+
+async def flush_logs() -> None:
+    """Sends everything still queued, then stops the worker. Called once on application shutdown."""
+    global _log_worker
+    if _log_worker is None or _log_worker.done():
+        return
+
+    # Queued behind the remaining entries, so the worker sends them all before exiting.
+    await _log_queue.put(_STOP)
+    await _log_worker
+    _log_worker = None
+
+# Strong references to in-flight fire-and-forget tasks so they aren't garbage-collected mid-run.
+_background_tasks: set = set()
+
+def fire_and_forget(coro) -> asyncio.Task:
+    """
+    Schedules a logging coroutine on the running event loop without awaiting it.
+
+    Args:
+        coro: The coroutine to run in the background (e.g., a `log_to_db_batch(...)` call).
+
+    Returns:
+        asyncio.Task: The scheduled task.
+    """
+    task = asyncio.create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    return task
+
+async def log_to_db_batch(project_id: int, entries: list) -> None:
+    """
+    Queues several structured log entries for the backend at once.
+
+    Args:
+        project_id (int): The ID of the project these logs are associated with.
+        entries (list): Dicts with 'message', and optionally 'level' and 'code' keys.
+    """
+    for entry in entries:
+        _enqueue({
+            "projectId": project_id,
+            "message": entry["message"],
+            "level": entry.get("level", "error"),
+            "code": entry.get("code")
+        })
@@ -0,0 +1,136 @@
+# FILE: brain/services/openai_batch_service.py
+# Purpose: Buffers agent summarization requests and submits them as OpenAI Batch API jobs,
+#          saving each summary once its batch completes. Enabled via USE_BATCH_SUMMARIZATION.
+
+import asyncio
+import json
+
+from constants import BATCH_POLL_INTERVAL_SECONDS
+from debug_flags import debug_openai_batch_service as debug
+from services import api_client
+from services import logger_service
+from services import openai_service
+from utils.console_log import log_console
+
+# Batches are billed to an account, so pending requests are buffered per API key.
+# api_key -> list of JSONL request lines (as dicts)
+_PENDING: dict[str, list[dict]] = {}
+
+# Strong references to the batch pollers so they are not garbage collected mid-run.
+_POLLERS: set = set()
+
+# custom_ids queued or awaiting a batch result; an agent keeps crossing the summary
+# threshold until its summary lands, so repeat requests are dropped meanwhile.
+_IN_FLIGHT: set[str] = set()
+
+_TERMINAL_STATUSES = frozenset({"completed", "failed", "expired", "cancelled"})
+
+def enqueue_summary(project_id: int, agent_id: int, messages: list, api_key: str, model: str = "gpt-4o") -> None:
+    """
+    Queues one agent summarization request for the next batch submission.
+
+    Args:
+        project_id (int): The ID of the project.
+        agent_id (int): The ID of the agent being summarized.
+        messages (list): The user-side messages to summarize (system prompt is added here).
+        api_key (str): The OpenAI API key the batch is submitted with.
+        model (str, optional): The OpenAI model to use. Defaults to "gpt-4o".
+    """
+    custom_id = f"project-{project_id}-agent-{agent_id}"
+    if custom_id in _IN_FLIGHT:
+        return
+    _IN_FLIGHT.add(custom_id)
+
+    _PENDING.setdefault(api_key, []).append({
+        "custom_id": custom_id,
+        "method": "POST",
+        "url": "/v1/chat/completions",
+        "body": {
+            "model": model,
+            "messages": [openai_service.SUMMARIZER_SYSTEM_MESSAGE] + messages,
+            "temperature": 0.3,
+            "max_tokens": 512,
+        },
+    })
+    if debug:
+        log_console(f"📦 Queued batch summary for agent {agent_id} in project {project_id}")
+
+async def flush() -> None:
+    """Submits every buffered request as one batch per API key and starts a poller for each."""
+    while _PENDING:
+        api_key, requests = _PENDING.popitem()
+        try:
+            client = openai_service.get_client(api_key)
+            jsonl = "\n".join(json.dumps(request, ensure_ascii=False) for request in requests).encode("utf-8")
+            input_file = await client.files.create(file=("summaries.jsonl", jsonl), purpose="batch")
+            batch = await client.batches.create(
+                input_file_id=input_file.id,
+                endpoint="/v1/chat/completions",
+                completion_window="24h",
+            )
+        except Exception as e:
+            log_console(f"❌ Failed to submit summarization batch of {len(requests)} request(s): {e}", level="error", debug_flag=True)
+            _IN_FLIGHT.difference_update(request["custom_id"] for request in requests)
+            continue
+
+        if debug:
+            log_console(f"📤 Submitted summarization batch {batch.id} with {len(requests)} request(s)")
+        poller = asyncio.create_task(_poll_batch(api_key, batch.id, [request["custom_id"] for request in requests]))
+        _POLLERS.add(poller)
+        poller.add_done_callback(_POLLERS.discard)
+
+async def _poll_batch(api_key: str, batch_id: str, custom_ids: list) -> None:
+    """Waits for a batch to finish, then saves every successful summary it produced."""
+    client = openai_service.get_client(api_key)
+    try:
+        while True:
+            batch = await client.batches.retrieve(batch_id)
+            if batch.status in _TERMINAL_STATUSES:
+                break
+            await asyncio.sleep(BATCH_POLL_INTERVAL_SECONDS)
+
+        if batch.status != "completed" or not batch.output_file_id:
+            log_console(f"⚠️ Summarization batch {batch_id} ended with status '{batch.status}'.", level="warn", debug_flag=True)
+            return
+
+        output = await client.files.content(batch.output_file_id)
+        for line in output.text.splitlines():
+            if line.strip():
+                await _save_batch_result(json.loads(line))
+
+    except Exception as e:
+        log_console(f"❌ Failed while processing summarization batch {batch_id}: {e}", level="error", debug_flag=True)
+    finally:
+        _IN_FLIGHT.difference_update(custom_ids)
+
+async def _save_batch_result(result: dict) -> None:
+    """Saves the summary carried by one batch output line."""
+    _, project_id, _, agent_id = result["custom_id"].split("-")
+    project_id, agent_id = int(project_id), int(agent_id)
+
+    response = result.get("response") or {}
+    if result.get("error") or response.get("status_code") != 200:
+        await logger_service.log_to_db(
+            project_id,
+            f"Batched summarization failed for agent {agent_id}: {result.get('error') or response.get('status_code')}",
+            level="warn",
+            code="BATCH_SUMMARY_FAILED"
+        )
+        return
+
+    summary = (response["body"]["choices"][0]["message"]["content"] or "").strip()
+    if not summary:
+        return
+
+    await api_client.save_summary({
+        "projectId": project_id,
+        "agentId": agent_id,
+        "summary": summary,
+        "historyJson": None
+    })
+    logger_service.fire_and_forget(logger_service.log_to_db(
+        project_id,
+        f"Batched summary saved for agent {agent_id}.",
+        level="debug",
+        code="SUMMARY_SAVED"
+    ))
@@ -2,12 +2,17 @@
 # Purpose: Provides a dedicated service for all interactions with the OpenAI API,
 #          handling both structured chat completions and message summarization.
 
+import asyncio
 import openai
+import httpx
+import random
 import json
 import datetime
 from debug_flags import debug_openai_service as debug #
 from utils.console_log import log_console #
 from services import logger_service # New: Import the dedicated logger service
+from services.chat_batcher import ChatBatcher
+from constants import CHAT_BATCH_MAX_SIZE, CHAT_BATCH_MAX_WAIT_MS, CHAT_BATCH_QUEUE_SIZE, RATE_LIMIT_MAX_RETRIES, RATE_LIMIT_MAX_BACKOFF_SECONDS
 
 # The local file logging feature is for deep debugging only and is kept commented out.
 # LOG_FILE = "openai_prompt_log.txt"
@@ -28,6 +33,127 @@ from services import logger_service # New: Import the dedicated logger service
 #         log_console(f"Original content for {title}: {content}", level="debug", debug_flag=True)
 
 
+# Structured-output schema for agent replies, built once at import and shared by every request.
+_AGENT_REPLY_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "agent_reply",
+        "description": "Structured reply from the agent, adhering to the specified JSON format.",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "from": {"type": "string", "description": "The name of the agent sending the message."},
+                "to": {"type": "string", "description": "The name of the agent intended to receive the message."},
+                "body": {"type": "string", "description": "The main content of the message."}
+            },
+            "required": ["from", "to", "body"],
+            "additionalProperties": False
+        }
+    }
+}
+
+# System prompt shared by direct and batched summarization requests.
+SUMMARIZER_SYSTEM_MESSAGE = {
+    "role": "system",
+    "content": "You are an AI summarizer. Summarize the following conversation/messages as a task-focused memory. Retain key facts, decisions, and outcomes. Do not add interpretations or analysis. Be concise, clear, and specific."
+}
+
+# HTTP/2 needs the optional `h2` package; without it the clients stay on HTTP/1.1.
+try:
+    import h2  # noqa: F401
+    _HTTP2_AVAILABLE = True
+except ImportError:
+    _HTTP2_AVAILABLE = False
+
+# One client per API key, created on first use and closed together on shutdown.
+# Nothing is evicted, so no client is ever dropped while it still holds open connections.
+_CLIENTS: dict[str, openai.AsyncOpenAI] = {}
+
+def get_client(api_key: str) -> openai.AsyncOpenAI:
+    """
+    Returns a shared AsyncOpenAI client for the given API key, creating it on first use.
+
+    Reusing the client keeps its connection pool (and TLS sessions) warm across calls;
+    with HTTP/2, concurrent requests are multiplexed over the same connection.
+    """
+    client = _CLIENTS.get(api_key)
+    if client is not None:
+        return client
+
+    client = openai.AsyncOpenAI(
+        api_key=api_key,
+        http_client=openai.DefaultAsyncHttpxClient(
+            http2=_HTTP2_AVAILABLE,
+            limits=httpx.Limits(max_connections=200, max_keepalive_connections=100),
+            timeout=httpx.Timeout(120.0, connect=5.0),
+        ),
+    )
+    _CLIENTS[api_key] = client
+    return client
+
+# The same clients with the SDK's own retries turned off, for agent chat completions:
+# `_submit_with_rate_limit_retry` already retries 429s (honouring Retry-After), and stacking
+# the SDK's retries under it would multiply the attempts and the total backoff.
+# `with_options` shares the base client's connection pool, so only the base clients are closed.
+_CHAT_CLIENTS: dict[str, openai.AsyncOpenAI] = {}
+
+def _get_chat_client(api_key: str) -> openai.AsyncOpenAI:
+    """Returns the shared client for `api_key` with SDK-level retries disabled."""
+    client = _CHAT_CLIENTS.get(api_key)
+    if client is None:
+        client = _CHAT_CLIENTS[api_key] = get_client(api_key).with_options(max_retries=0)
+    return client
+
+# Agent chat completions from all project tasks are funnelled through one batcher.
+_chat_batcher = ChatBatcher(
+    _get_chat_client,
+    max_batch=CHAT_BATCH_MAX_SIZE,
+    max_wait_ms=CHAT_BATCH_MAX_WAIT_MS,
+    queue_size=CHAT_BATCH_QUEUE_SIZE,
+)
+
+async def _submit_with_rate_limit_retry(api_key: str, kwargs: dict):
+    """
+    Submits a chat completion, retrying transient 429s with exponential backoff and jitter
+    (or the server's Retry-After, when given). Exhausted quota is not retried.
+
+    Raises:
+        openai.RateLimitError: Once RATE_LIMIT_MAX_RETRIES retries are used up, or on exhausted quota.
+    """
+    for attempt in range(RATE_LIMIT_MAX_RETRIES + 1):
+        try:
+            return await _chat_batcher.submit(api_key, kwargs)
+        except openai.RateLimitError as e:
+            if attempt == RATE_LIMIT_MAX_RETRIES or e.code == "insufficient_quota":
+                raise
+            delay = min(2 ** attempt + random.random(), RATE_LIMIT_MAX_BACKOFF_SECONDS)
+            retry_after = e.response.headers.get("retry-after") if e.response is not None else None
+            if retry_after:
+                try:
+                    delay = min(float(retry_after), RATE_LIMIT_MAX_BACKOFF_SECONDS)
+                except ValueError:
+                    pass
+            log_console(f"⏳ OpenAI rate limit hit; retrying in {delay:.1f}s (attempt {attempt + 1}/{RATE_LIMIT_MAX_RETRIES}).", level="warn", debug_flag=debug)
+            await asyncio.sleep(delay)
+
+async def _collect_stream(stream) -> str:
+    """Assembles the text deltas of a streamed chat completion into the full reply."""
+    parts = []
+    async for chunk in stream:
+        if chunk.choices:
+            delta = chunk.choices[0].delta.content
+            if delta:
+                parts.append(delta)
+    return "".join(parts)
+
+async def close_clients() -> None:
+    """Stops the chat batcher and closes all cached OpenAI clients. Called once on application shutdown."""
+    await _chat_batcher.close()
+    _CHAT_CLIENTS.clear()
+    while _CLIENTS:
+        await _CLIENTS.popitem()[1].close()
+
 async def send_chat_completion(messages: list, model: str = "gpt-4o", api_key: str = None, use_schema: bool = True, project_id: int = None) -> str:
     """
     Sends a list of message objects to the OpenAI Chat Completions API.
@@ -37,6 +163,7 @@ async def send_chat_completion(messages: list, model: str = "gpt-4o", api_key: s
 
     Args:
         messages (list): A list of message objects for the chat conversation.
+                         Treated as read-only; callers may reuse it across retries.
         model (str, optional): The OpenAI model to use. Defaults to "gpt-4o".
         api_key (str, optional): The OpenAI API key.
         use_schema (bool, optional): If True, forces the model to reply in a
@@ -50,8 +177,6 @@ async def send_chat_completion(messages: list, model: str = "gpt-4o", api_key: s
         Exception: For specific API errors (e.g., "INVALID_API_KEY", "OPENAI_BAD_REQUEST").
     """
     try:
-        client = openai.AsyncOpenAI(api_key=api_key)
-
         log_console(f"✉️ Sending {len(messages)} messages to OpenAI model {model}. Schema: {use_schema}", debug_flag=debug)
 
         kwargs = {
@@ -61,27 +186,12 @@ async def send_chat_completion(messages: list, model: str = "gpt-4o", api_key: s
         }
 
         if use_schema:
-            kwargs["response_format"] = {
-                "type": "json_schema",
-                "json_schema": {
-                    "name": "agent_reply",
-                    "description": "Structured reply from the agent, adhering to the specified JSON format.",
-                    "strict": True,
-                    "schema": {
-                        "type": "object",
-                        "properties": {
-                            "from": {"type": "string", "description": "The name of the agent sending the message."},
-                            "to": {"type": "string", "description": "The name of the agent intended to receive the message."},
-                            "body": {"type": "string", "description": "The main content of the message."}
-                        },
-                        "required": ["from", "to", "body"],
-                        "additionalProperties": False
-                    }
-                }
-            }
-
-        response = await client.chat.completions.create(**kwargs)
-        content = response.choices[0].message.content
+            kwargs["response_format"] = _AGENT_REPLY_RESPONSE_FORMAT
+        else:
+            kwargs["stream"] = True # Free-form replies are streamed; structured ones are validated whole.
+
+        response = await _submit_with_rate_limit_retry(api_key, kwargs)
+        content = await _collect_stream(response) if not use_schema else response.choices[0].message.content
 
         log_console("🗣️ Assistant raw response received.", debug_flag=debug)
         if len(content) < 300:
@@ -138,12 +248,9 @@ async def summarize_messages(messages_to_summarize: list, model: str = "gpt-4o",
     """
     log_console(f"📚 Summarizing {len(messages_to_summarize)} messages using model {model}", level="debug", debug_flag=debug)
 
-    client = openai.AsyncOpenAI(api_key=api_key)
+    client = get_client(api_key)
 
-    chat_messages_for_summary = [{
-        "role": "system",
-        "content": "You are an AI summarizer. Summarize the following conversation/messages as a task-focused memory. Retain key facts, decisions, and outcomes. Do not add interpretations or analysis. Be concise, clear, and specific."
-    }] + messages_to_summarize
+    chat_messages_for_summary = [SUMMARIZER_SYSTEM_MESSAGE, *messages_to_summarize]
 
     try:
         response = await client.chat.completions.create(
@@ -151,9 +258,10 @@ async def summarize_messages(messages_to_summarize: list, model: str = "gpt-4o",
             messages=chat_messages_for_summary,
             temperature=0.3,
             max_tokens=512,
+            stream=True,
         )
 
-        summary_content = response.choices[0].message.content.strip()
+        summary_content = (await _collect_stream(response)).strip()
 
         log_console("🧠 Summary result received.", debug_flag=debug)
         if len(summary_content) < 300:
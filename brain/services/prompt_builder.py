@@ -1,28 +1,28 @@
 # FILE: brain/services/prompt_builder.py
 # Purpose: Manages the construction of structured prompts for the AI agent LLM.
 
+from functools import lru_cache
+from types import MappingProxyType
+
 from constants import FFORMAT_RULES, SYSTEM_ROLE_TAG
 
-def _format_historical_message_content(db_message_row: dict, id_to_name_map: dict) -> str:
-    """
-    Formats the content string for a single historical message,
-    including [FROM: SenderName TO: ReceiverName] prefixes.
-    """
-    sender_name = id_to_name_map.get(db_message_row["sender_id"], "UnknownSender")
-    receiver_name = id_to_name_map.get(db_message_row.get("receiver_id"), "UnknownReceiver")
-    
-    # Handle special case for System Agent (ID 0) if its name isn't in the map.
-    if db_message_row["sender_id"] == 0 and sender_name == "UnknownSender":
-        sender_name = "System"
+# Read-only stand-in for a missing id_to_name_map (avoids a shared mutable default).
+_EMPTY_NAME_MAP = MappingProxyType({})
 
-    return f"[FROM: {sender_name} TO: {receiver_name}] {db_message_row['content'].strip()}"
+# Fixed parts of the main system prompt, prepared once at import.
+_FFORMAT_RULES_STRIPPED = FFORMAT_RULES.strip()
+_SYSTEM_ROLE_HEADER = f"{SYSTEM_ROLE_TAG}\n" # The role tag sits directly above the agent's own prompt.
+
+def display_name(id_to_name_map: dict | None, agent_id: int | None, default: str) -> str:
+    """Looks up an agent's name, returning `default` for unknown or missing IDs."""
+    return (id_to_name_map or _EMPTY_NAME_MAP).get(agent_id, default)
 
 def build_main_system_prompt(project_system_prompt: str, agent_system_prompt: str) -> str:
     """
     Builds the main system prompt for the LLM, combining project-specific
     and agent-specific instructions, along with general formatting rules.
     """
-    return f"{project_system_prompt.strip()}\n\n{FFORMAT_RULES.strip()}\n\n{SYSTEM_ROLE_TAG}\n{agent_system_prompt.strip()}"
+    return "\n\n".join((project_system_prompt.strip(), _FFORMAT_RULES_STRIPPED, _SYSTEM_ROLE_HEADER + agent_system_prompt.strip()))
 
 def build_summary_context_prompt(summary_text: str) -> str:
     """
@@ -30,13 +30,39 @@ def build_summary_context_prompt(summary_text: str) -> str:
     """
     return f"Here’s a summary of the conversation so far:\n{summary_text.strip()}"
 
+@lru_cache(maxsize=128)
+def _prompt_prefix(main_system_prompt_content: str, summary_text: str | None) -> tuple:
+    """
+    Builds the leading system messages (main prompt, then optional summary) of a chat prompt.
+
+    Both inputs are stable per agent between summaries, so the result is cached. The returned
+    dicts are shared between prompts and must not be mutated; appending to the list is fine.
+    """
+    prefix = []
+
+    # Add main system prompt.
+    if main_system_prompt_content:
+        prefix.append({
+            "role": "system",
+            "content": main_system_prompt_content
+        })
+
+    # Add conversation summary as a system message.
+    if summary_text:
+        prefix.append({
+            "role": "system",
+            "content": build_summary_context_prompt(summary_text)
+        })
+
+    return tuple(prefix)
+
 def build_chat_prompt(
     main_system_prompt_content: str,
     summary_text: str = None,
-    historical_messages_db_rows: list = [],
+    historical_messages_db_rows: list | None = None,
     current_user_message_formatted_content: str = "",
     current_agent_id_for_perspective: int = None,
-    id_to_name_map: dict = {}
+    id_to_name_map: dict | None = None
 ) -> list:
     """
     Builds the full chat prompt (list of message dictionaries) for the OpenAI API.
@@ -54,33 +80,20 @@ def build_chat_prompt(
             perspective is being used to determine "user" vs "assistant" roles for history.
         id_to_name_map (dict, optional): A dictionary mapping agent IDs to agent names.
     """
-    messages = []
-
-    # Add main system prompt.
-    if main_system_prompt_content:
-        messages.append({
-            "role": "system",
-            "content": main_system_prompt_content
-        })
-
-    # Add conversation summary as a system message.
-    if summary_text:
-        messages.append({
-            "role": "system",
-            "content": build_summary_context_prompt(summary_text)
-        })
+    # System prompt + summary prefix, shared across calls (see `_prompt_prefix`).
+    messages = list(_prompt_prefix(main_system_prompt_content, summary_text))
 
     # Add historical messages from the database.
+    # Each row becomes "[FROM: Sender TO: Receiver] content"; the System Agent (ID 0) is named
+    # "System" when it isn't in the map. Messages this agent sent are "assistant", the rest "user".
     if historical_messages_db_rows and current_agent_id_for_perspective is not None:
-        for msg_row in historical_messages_db_rows:
-            # Determine role based on the current agent's perspective.
-            role_for_llm = "user" # Default for messages received by the current agent.
-            if msg_row["sender_id"] == current_agent_id_for_perspective:
-                role_for_llm = "assistant" # Messages sent by the current agent in the past.
-            
+        for row in historical_messages_db_rows:
+            sender_id = row["sender_id"]
+            sender_name = display_name(id_to_name_map, sender_id, "System" if sender_id == 0 else "UnknownSender")
+            receiver_name = display_name(id_to_name_map, row.get("receiver_id"), "UnknownReceiver")
             messages.append({
-                "role": role_for_llm,
-                "content": _format_historical_message_content(msg_row, id_to_name_map)
+                "role": "assistant" if sender_id == current_agent_id_for_perspective else "user",
+                "content": f"[FROM: {sender_name} TO: {receiver_name}] {row['content'].strip()}",
             })
 
     # Add the current user message that the agent needs to respond to.
@@ -0,0 +1,102 @@
+# FILE: brain/services/summary_cache.py
+# Purpose: Per-project cache in front of the LLM summarizer. Exact repeats are matched by a
+#          SHA-256 of the conversation text; near-duplicates by embedding cosine similarity
+#          only when USE_SEMANTIC_SUMMARY_CACHE is enabled (off by default).
+
+import hashlib
+from collections import OrderedDict
+
+from constants import (
+    SUMMARY_CACHE_MAX_ENTRIES, USE_SEMANTIC_SUMMARY_CACHE,
+    SUMMARY_CACHE_SIMILARITY_THRESHOLD, SUMMARY_CACHE_EMBEDDING_MODEL,
+)
+from debug_flags import debug_summary_cache as debug
+from services import openai_service
+from utils.console_log import log_console
+
+# numpy is only needed for the semantic lookup; without it the cache is exact-match only.
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# (project_id, agent_id) -> OrderedDict(digest -> (summary, embedding or None)), least recently used first.
+# Entries never cross projects or agents, so one agent's summary can't be served to another.
+_SUMMARY_CACHE: dict[tuple[int, int], OrderedDict] = {}
+
+async def get_or_summarize(project_id: int, agent_id: int, conversation_text: str, api_key: str, summarize) -> str | None:
+    """
+    Returns a cached summary for `conversation_text`, or runs `summarize()` and caches its result.
+
+    The key is the conversation extract alone, not the full request: the request also carries
+    the agent's previous summary, which changes on every run and would make every key unique.
+
+    Args:
+        project_id (int): The ID of the project the conversation belongs to.
+        agent_id (int): The ID of the agent whose memory is being summarized.
+        conversation_text (str): The conversation lines being summarized (without the previous summary).
+        api_key (str): The OpenAI API key, used for the embedding lookup.
+        summarize: Zero-argument callable returning an awaitable that produces the summary.
+
+    Returns:
+        str | None: The cached or freshly generated summary.
+    """
+    entries = _SUMMARY_CACHE.setdefault((project_id, agent_id), OrderedDict())
+    digest = hashlib.sha256(conversation_text.encode("utf-8")).hexdigest()
+
+    # 1. Exact match.
+    hit = entries.get(digest)
+    if hit is not None:
+        entries.move_to_end(digest)
+        if debug:
+            log_console(f"🗃️ Summary cache exact hit for project {project_id}", debug_flag=debug)
+        return hit[0]
+
+    # 2. Near-duplicate match on embeddings.
+    embedding = None
+    if USE_SEMANTIC_SUMMARY_CACHE and np is not None:
+        embedding = await _embed(conversation_text, api_key)
+        if embedding is not None:
+            similar = _most_similar(entries, embedding)
+            if similar is not None:
+                if debug:
+                    log_console(f"🗃️ Summary cache semantic hit for project {project_id}", debug_flag=debug)
+                return similar
+
+    # 3. Miss: summarize and remember the result.
+    summary = await summarize()
+    if summary:
+        entries[digest] = (summary, embedding)
+        if len(entries) > SUMMARY_CACHE_MAX_ENTRIES:
+            entries.popitem(last=False)
+    return summary
+
+async def _embed(text: str, api_key: str):
+    """Returns the normalized embedding of `text`, or None if the embedding call fails."""
+    try:
+        response = await openai_service.get_client(api_key).embeddings.create(
+            model=SUMMARY_CACHE_EMBEDDING_MODEL, input=text
+        )
+    except Exception as e:
+        log_console(f"⚠️ Summary cache embedding failed, skipping semantic lookup: {e}", level="warn", debug_flag=debug)
+        return None
+
+    vector = np.asarray(response.data[0].embedding, dtype=np.float32)
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else None
+
+def _most_similar(entries: OrderedDict, query) -> str | None:
+    """Returns the cached summary whose embedding is closest to `query`, if it clears the threshold."""
+    keyed = [(digest, embedding) for digest, (_, embedding) in entries.items() if embedding is not None]
+    if not keyed:
+        return None
+
+    # Stored embeddings are already unit length, so the dot product is the cosine similarity.
+    similarities = np.stack([embedding for _, embedding in keyed]) @ query
+    best = int(np.argmax(similarities))
+    if similarities[best] < SUMMARY_CACHE_SIMILARITY_THRESHOLD:
+        return None
+
+    digest = keyed[best][0]
+    entries.move_to_end(digest)
+    return entries[digest][0]
@@ -2,9 +2,11 @@
 # Purpose: Provides a centralized and conditional console logging utility
 #          with standardized, level-based formatting.
 
+from typing import Callable
+
 from debug_flags import debug_console_log as default_debug
 
-def log_console(msg: str, level: str = "info", debug_flag: bool | None = None) -> None:
+def log_console(msg: str | Callable[[], str], level: str = "info", debug_flag: bool | None = None) -> None:
     """
     Prints a formatted message to the console, conditionally based on debug settings.
 
@@ -19,8 +21,11 @@ def log_console(msg: str, level: str = "info", debug_flag: bool | None = None) -
     3.  **Error Override:** Messages with `level="error"` are always printed to the console,
         regardless of debug settings, to ensure critical issues are visible.
 
+    Expensive messages can be passed as a zero-argument callable (e.g. a lambda around an
+    f-string); it is only called once the message is known to be printed.
+
     Args:
-        msg (str): The message content to be printed.
+        msg (str | Callable[[], str]): The message content, or a callable that builds it.
         level (str, optional): The log level ('info', 'error', 'warn', 'debug'). Defaults to "info".
         debug_flag (bool | None, optional): Overrides module's default debug setting for this message.
     """
@@ -44,4 +49,7 @@ def log_console(msg: str, level: str = "info", debug_flag: bool | None = None) -
     elif level == "debug":
         prefix = "🐞 [DEBUG]"
     
+    if callable(msg):
+        msg = msg()
+
     print(f"{prefix}: {msg}")
\ No newline at end of file
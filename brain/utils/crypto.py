@@ -2,20 +2,38 @@
 # Purpose: Provides cryptographic utilities, specifically for token decryption.
 
 from debug_flags import debug_crypto as debug
-from Crypto.Cipher import AES
-from Crypto.Util.Padding import unpad
+from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from cryptography.exceptions import InvalidTag
+from cryptography.hazmat.primitives.padding import PKCS7
 import base64
 import binascii
 
 from config import ENCRYPT_SECRET
 
-# Validate the encryption secret key length.
-if not ENCRYPT_SECRET or len(ENCRYPT_SECRET.encode("utf-8")) != 32:
+# Encode the secret once and validate the resulting key length.
+_KEY: bytes = ENCRYPT_SECRET.encode("utf-8") if ENCRYPT_SECRET else b""
+if len(_KEY) != 32:
     raise ValueError("ENCRYPT_SECRET must be exactly 32 characters")
 
+# The key is fixed for the life of the process, so its cipher algorithm is built once.
+# `cryptography` runs the cipher through OpenSSL's EVP interface (AES-NI where available).
+_AES_ALG = algorithms.AES(_KEY)
+
+# AES-256-GCM for current "nonce_hex:ct_hex:tag_hex" tokens. The key schedule is set up
+# once here; each call only supplies its nonce.
+_AESGCM = AESGCM(_KEY)
+
+# Legacy CBC per-call work is limited to the IV-bound decryptor and a fresh unpadder.
+_PKCS7 = PKCS7(algorithms.AES.block_size)
+
+# Hex length of the 16-byte IV that prefixes every legacy CBC token.
+_IV_HEX_LEN = 32
+
 def decrypt_token(encrypted: str) -> str:
     """
-    Decrypts a token encoded in "iv_hex:data_hex" format using AES-256-CBC.
+    Decrypts a token encoded as "nonce_hex:ct_hex:tag_hex" (AES-256-GCM) or, for tokens
+    stored before the GCM switch, "iv_hex:data_hex" (AES-256-CBC).
 
     Args:
         encrypted (str): The encrypted token string.
@@ -27,14 +45,33 @@ def decrypt_token(encrypted: str) -> str:
         ValueError: If decryption fails.
     """
     try:
-        iv_hex, data_hex = encrypted.split(":")
-        iv = bytes.fromhex(iv_hex)
-        data = bytes.fromhex(data_hex)
-        key = ENCRYPT_SECRET.encode("utf-8")
+        # Encode once; the hex fields are handed to unhexlify as zero-copy memoryview slices.
+        buf = encrypted.encode("ascii")
+        mv = memoryview(buf)
+        if buf.count(b":") == 2:
+            first = buf.index(b":")
+            second = buf.index(b":", first + 1)
+            # AESGCM takes the tag appended to the ciphertext and verifies it while decrypting.
+            decrypted = _AESGCM.decrypt(
+                binascii.unhexlify(mv[:first]),
+                binascii.unhexlify(mv[first + 1:second]) + binascii.unhexlify(mv[second + 1:]),
+                None
+            )
+            return decrypted.decode("utf-8")
+
+        # Legacy CBC: the IV is always 16 bytes, so the separator is expected at offset 32
+        # and only searched for otherwise.
+        colon = _IV_HEX_LEN if buf[_IV_HEX_LEN:_IV_HEX_LEN + 1] == b":" else buf.index(b":")
+        iv = binascii.unhexlify(mv[:colon])
+        data = binascii.unhexlify(mv[colon + 1:])
 
-        cipher = AES.new(key, AES.MODE_CBC, iv)
-        decrypted = unpad(cipher.decrypt(data), AES.block_size)
+        decryptor = Cipher(_AES_ALG, modes.CBC(iv)).decryptor()
+        padded = decryptor.update(data) + decryptor.finalize()
+        unpadder = _PKCS7.unpadder() # Unpadders are single-use; the padding spec is shared.
+        decrypted = unpadder.update(padded) + unpadder.finalize()
         return decrypted.decode("utf-8")
 
-    except Exception as e:
-        raise ValueError(f"Failed to decrypt token: {e}")
\ No newline at end of file
+    except (ValueError, InvalidTag) as e:
+        # binascii.Error, UnicodeError, bad padding and malformed tokens are all ValueErrors;
+        # InvalidTag means the GCM authentication check failed.
+        raise ValueError(f"Failed to decrypt token: {e!r}") from e
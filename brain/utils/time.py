@@ -2,13 +2,22 @@ import asyncio
 from utils.console_log import log_console
 from debug_flags import debug_retry as debug # Controls verbose logging for this module.
 
-async def sleep_interval(seconds: float = 2.0) -> None:
+_WAKE_MSG = "⏰ Woke up, continuing loop."
+_DEFAULT_SLEEP_SECONDS = 2.0
+_DEFAULT_SLEEP_MSG = f"⏳ Sleeping for {_DEFAULT_SLEEP_SECONDS} seconds..."
+
+async def sleep_interval(seconds: float = _DEFAULT_SLEEP_SECONDS) -> None:
     """
     Asynchronously pauses execution for a specified duration, logging sleep and wake events.
+    Returns immediately, without touching the event loop, when there is nothing to wait for.
 
     Args:
         seconds (float, optional): The duration in seconds to sleep. Defaults to 2.0.
     """
-    log_console(f"⏳ Sleeping for {seconds} seconds...", debug_flag=debug)
+    if seconds <= 0:
+        return
+    if debug:
+        log_console(_DEFAULT_SLEEP_MSG if seconds == _DEFAULT_SLEEP_SECONDS else f"⏳ Sleeping for {seconds} seconds...")
     await asyncio.sleep(seconds)
-    log_console("⏰ Woke up, continuing loop.", debug_flag=debug)
\ No newline at end of file
+    if debug:
+        log_console(_WAKE_MSG)
\ No newline at end of file
@@ -0,0 +1,51 @@
+# FILE: brain/utils/tokens.py
+# Purpose: Token counting for prompt budgeting, using tiktoken when it is installed.
+
+from functools import lru_cache
+
+from debug_flags import debug_token_count as debug
+from utils.console_log import log_console
+
+# tiktoken (and its encoding files) are optional; fall back to a ~4 characters/token estimate.
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+@lru_cache(maxsize=None)
+def _get_encoding():
+    """
+    Loads the gpt-4o encoding on first use rather than at import, since tiktoken may
+    download its encoding files. Returns None (estimate mode) if it can't be loaded.
+    """
+    if tiktoken is None:
+        log_console("⚠️ tiktoken not installed, estimating token counts.", level="warn", debug_flag=debug)
+        return None
+    try:
+        return tiktoken.encoding_for_model("gpt-4o")
+    except Exception as e:
+        log_console(f"⚠️ tiktoken encoding unavailable, estimating token counts: {e}", level="warn", debug_flag=debug)
+        return None
+
+def count_tokens(text: str) -> int:
+    """Returns the number of gpt-4o tokens in `text` (estimated if tiktoken is unavailable)."""
+    encoding = _get_encoding()
+    if encoding is None:
+        return (len(text) + 3) // 4
+    return len(encoding.encode(text))
+
+def take_within_token_budget(lines: list, budget: int) -> tuple[list, int]:
+    """
+    Returns the leading lines that fit in `budget` tokens, and their total token count.
+
+    Args:
+        lines (list): Strings in priority order (the first lines are kept first).
+        budget (int): Maximum total tokens to keep.
+    """
+    total = 0
+    for index, line in enumerate(lines):
+        line_tokens = count_tokens(line)
+        if total + line_tokens > budget:
+            return lines[:index], total
+        total += line_tokens
+    return lines, total
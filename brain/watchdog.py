@@ -3,7 +3,6 @@
 # Designed to be run by an external scheduler (e.g., Cron, Cloud Scheduler).
 
 import asyncio
-from datetime import datetime, timedelta, timezone
 
 from services import api_client
 from services import logger_service
@@ -14,6 +13,34 @@ from utils.console_log import log_console
 STALE_PENDING_TIMEOUT_MINUTES = 1.5 
 INACTIVITY_TIMEOUT_MINUTES = 1.5
 LOCAL_LOOP_INTERVAL_SECONDS = 10 
+MAX_CONCURRENT_PROJECT_CHECKS = 16 # Stalled projects paused in parallel per tick.
+STALLED_PAGE_SIZE = 500 # Stalled projects fetched per page (the backend caps this at 500).
+
+# Log lines per pause reason: (console action, database log message).
+_PAUSE_NOTICES = {
+    "STUCK_QUEUE_TIMEOUT": (
+        f"Pending message is older than {STALE_PENDING_TIMEOUT_MINUTES} min.",
+        f"Project stalled due to stuck pending message (>{STALE_PENDING_TIMEOUT_MINUTES}min). Pausing.",
+    ),
+    "IDLE_TIMEOUT": (
+        f"Idle for more than {INACTIVITY_TIMEOUT_MINUTES} min.",
+        f"Project idle for over {INACTIVITY_TIMEOUT_MINUTES} minutes. Pausing.",
+    ),
+}
+
+async def _pause_stalled_project(project_id: int, reason: str, age_seconds: float, semaphore: asyncio.Semaphore) -> None:
+    """
+    Logs and pauses one project the backend reported as stalled.
+    The semaphore bounds how many projects are paused at once.
+    """
+    async with semaphore:
+        action, db_message = _PAUSE_NOTICES[reason]
+        log_console(f"--- Project ID: {project_id} ({reason}, {int(age_seconds)} seconds) ---")
+        log_console(f"  ACTION: Pausing project {project_id}. Reason: {action}", "warn")
+        await asyncio.gather(
+            logger_service.log_to_db(project_id, db_message, level="warn", code=reason),
+            api_client.pause_project(project_id, reason)
+        )
 
 async def check_for_stalled_projects():
     """
@@ -29,58 +56,32 @@ async def check_for_stalled_projects():
     )
     
     try:
-        active_projects = await api_client.get_active_projects()
-        
-        if not active_projects:
-            log_console("🐶 Watchdog Task: No active projects found.")
-            return
-
-        now_utc = datetime.now(timezone.utc)
-
-        for project in active_projects:
-            project_id = project['id']
-            log_console(f"--- Checking Project ID: {project_id} ---")
-            
-            # Check for stale pending messages.
-            oldest_pending_data = await api_client.get_oldest_pending_message_timestamp(project_id)
-            oldest_pending_ts_str = oldest_pending_data.get('timestamp') if oldest_pending_data else None
-
-            if oldest_pending_ts_str:
-                oldest_pending_ts = datetime.fromisoformat(oldest_pending_ts_str.replace('Z', '+00:00'))
-                
-                message_age_seconds = (now_utc - oldest_pending_ts).total_seconds()
-                log_console(f"  [Stale Check] Oldest pending message is {int(message_age_seconds)} seconds old.")
-                
-                if message_age_seconds > STALE_PENDING_TIMEOUT_MINUTES * 60:
-                    log_console(f"  [Stale Check] ACTION: Pausing project {project_id}. Reason: Pending message is older than {STALE_PENDING_TIMEOUT_MINUTES} min.", "warn")
+        # The backend applies both timeouts in a single query and returns only the projects
+        # that tripped one, so healthy projects never cross the wire. Results arrive in
+        # keyset-paginated pages, so memory stays bounded by one page however many are stalled.
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_PROJECT_CHECKS)
+        stalled_count = 0
+        async for stalled_projects in api_client.iter_stalled_projects(
+            STALE_PENDING_TIMEOUT_MINUTES, INACTIVITY_TIMEOUT_MINUTES, page_size=STALLED_PAGE_SIZE
+        ):
+            stalled_count += len(stalled_projects)
+            results = await asyncio.gather(
+                *(_pause_stalled_project(project_id, reason, age_seconds, semaphore)
+                  for project_id, reason, age_seconds in stalled_projects),
+                return_exceptions=True
+            )
+            for (project_id, _, _), result in zip(stalled_projects, results):
+                if isinstance(result, Exception):
+                    log_console(f"❌ Watchdog check failed for project {project_id}: {result}", level="error")
                     await logger_service.log_to_db(
                         project_id,
-                        f"Project stalled due to stuck pending message (>{STALE_PENDING_TIMEOUT_MINUTES}min). Pausing.",
-                        level="warn",
-                        code="STUCK_QUEUE_TIMEOUT"
+                        f"Watchdog check failed for this project: {result}",
+                        level="error",
+                        code="WATCHDOG_CRASH"
                     )
-                    await api_client.pause_project(project_id, "STUCK_QUEUE_TIMEOUT")
-                    continue
-            else:
-                log_console("  [Stale Check] Project has no pending messages.")
 
-            # If no stuck messages, check for general inactivity.
-            last_activity_ts_str = project['last_activity_at']
-            if last_activity_ts_str:
-                last_activity_ts = datetime.fromisoformat(last_activity_ts_str.replace('Z', '+00:00'))
-                
-                activity_age_seconds = (now_utc - last_activity_ts).total_seconds()
-                log_console(f"  [Idle Check] Project has been idle for {int(activity_age_seconds)} seconds.")
-                
-                if activity_age_seconds > INACTIVITY_TIMEOUT_MINUTES * 60:
-                    log_console(f"  [Idle Check] ACTION: Pausing project {project_id}. Reason: Idle for more than {INACTIVITY_TIMEOUT_MINUTES} min.", "warn")
-                    await logger_service.log_to_db(
-                        project_id,
-                        f"Project idle for over {INACTIVITY_TIMEOUT_MINUTES} minutes. Pausing.",
-                        level="warn",
-                        code="IDLE_TIMEOUT"
-                    )
-                    await api_client.pause_project(project_id, "IDLE_TIMEOUT")
+        if not stalled_count:
+            log_console("🐶 Watchdog Task: No stalled projects found.")
 
     except Exception as e:
         log_console(f"❌ Watchdog Task error: {e}", level="error")
@@ -91,16 +92,30 @@ async def check_for_stalled_projects():
             code="WATCHDOG_CRASH"
         )
 
+# The sleep interval is fixed, so its log line is formatted once.
+_SLEEP_MSG = f"--- Watchdog sleeping until the next {LOCAL_LOOP_INTERVAL_SECONDS}s tick... ---\n"
+
 async def run_local_watchdog_loop():
     """
     Runs the watchdog in a continuous loop for local development and testing.
     """
     log_console("🐶 Watchdog service started in local polling mode.")
+    loop = asyncio.get_running_loop()
     while True:
+        # Ticks start every LOCAL_LOOP_INTERVAL_SECONDS on the monotonic clock, so a slow
+        # check shortens the following sleep instead of pushing every later tick back.
+        next_deadline = loop.time() + LOCAL_LOOP_INTERVAL_SECONDS
         await check_for_stalled_projects()
-        log_console(f"--- Watchdog sleeping for {LOCAL_LOOP_INTERVAL_SECONDS} seconds... ---\n")
-        await asyncio.sleep(LOCAL_LOOP_INTERVAL_SECONDS)
+        log_console(_SLEEP_MSG)
+        await asyncio.sleep(max(0, next_deadline - loop.time()))
+
+async def _main():
+    """Runs the local loop, sending any queued log entries before the process exits."""
+    try:
+        await run_local_watchdog_loop()
+    finally:
+        await logger_service.flush_logs()
 
 # Script entry point.
 if __name__ == "__main__":
-    asyncio.run(run_local_watchdog_loop())
\ No newline at end of file
+    asyncio.run(_main())
\ No newline at end of file